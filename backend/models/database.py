@@ -22,6 +22,7 @@ class Runner(BaseModel):
     trainer: Optional[str] = None
     weight: Optional[str] = None
     barrier: Optional[int] = None
+    odds: Dict[str, float] = Field(default_factory=dict)  # {bookmaker: odds}
 
 class RaceOdds(BaseModel):
     """Odds for a runner from a bookmaker"""
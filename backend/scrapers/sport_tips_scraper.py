@@ -2,27 +2,82 @@
 Expert Tips Scraper for AFL/NRL
 
 Sources:
-- Squiggle API (AFL) — stable public JSON API
-- FootyForecaster (AFL + NRL) — Playwright + BeautifulSoup
-
-Each source is wrapped in try/except so failures don't break the pipeline.
+- Squiggle API (AFL) — stable public JSON API, cached per season; only the
+  current and next rounds are re-fetched (conditionally) each run
+- FootyForecaster (AFL + NRL) — Playwright + utils/html_parser, on the shared
+  warm browser (see utils/browser_service.py)
+
+Sources are registered in SportTipsScraper._load_sources() with the sports
+they cover, a timeout budget and their concurrency, and run together under
+SPORT_TIPS_DEADLINE. A source that fails or runs out of time contributes no
+tips without breaking the pipeline.
 """
 
+import os
+import json
+import time
 import asyncio
 import re
 import httpx
-from typing import List, Dict, Optional
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from utils.run_metrics import RunMetrics
+from utils.atomic_file import write_json_atomic
 
 try:
-    from playwright.async_api import async_playwright
-    from bs4 import BeautifulSoup
+    from utils.html_parser import parse_html
+    from utils.browser_service import get_browser_service
+    from utils.parse_pool import run_parser
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
-    logger.warning("Playwright/BS4 not available — web scraping sources disabled")
-
+    logger.warning("Playwright/HTML parser not available — web scraping sources disabled")
+
+# Deadline for all sources together; sources still running are cancelled and
+# the tips gathered so far are returned
+SPORT_TIPS_DEADLINE = float(os.getenv("SPORT_TIPS_DEADLINE", 180))
+
+SQUIGGLE_URL = "https://api.squiggle.com.au/"
+SQUIGGLE_HEADERS = {"User-Agent": "TippingAggregator/1.0 (contact@tippingaggregator.com)"}
+
+# Season cache of Squiggle tips by round. The whole season is re-fetched
+# only when the cache is empty or hasn't been updated for SQUIGGLE_SEASON_TTL
+# seconds (e.g. the worker was off for weeks)
+SQUIGGLE_CACHE_DIR = os.getenv("SQUIGGLE_CACHE_DIR", "cache/squiggle")
+SQUIGGLE_SEASON_TTL = float(os.getenv("SQUIGGLE_SEASON_TTL", 7 * 86400))
+
+# A round stays "current" until this long after its last game starts
+SQUIGGLE_ROUND_GRACE = timedelta(hours=12)
+
+# FootyForecaster round navigation: every candidate element is read in one
+# DOM evaluation and the round is chosen in Python
+ROUND_LINK_SELECTOR = "a, button"
+ROUND_LABEL = re.compile(r"^\s*(\d{4})\s+(?:Opening Round|Round\s+(\d+))\b", re.IGNORECASE)
+ROUND_DATE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\b",
+    re.IGNORECASE
+)
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_ROUND_LINKS_JS = """
+els => els.map((el, index) => ({
+    index,
+    text: (el.innerText || el.textContent || '').trim(),
+    href: el.getAttribute('href') || '',
+    context: ((el.closest('tr, li') || el.parentElement || el).innerText || '').trim(),
+    visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+}))
+"""
+# Client-side round switches don't navigate; the switch is done once the
+# page text differs from before the click
+_PAGE_TEXT_JS = "() => document.body.innerText"
+_TEXT_CHANGED_JS = "before => document.body.innerText !== before"
 
 # Team name aliases for fuzzy matching across sources
 AFL_TEAM_ALIASES: Dict[str, List[str]] = {
@@ -67,24 +122,83 @@ NRL_TEAM_ALIASES: Dict[str, List[str]] = {
 }
 
 
-def normalize_team_name(name: str, sport: str) -> Optional[str]:
-    """Match a team name string to canonical team name using aliases"""
-    aliases = AFL_TEAM_ALIASES if sport == "afl" else NRL_TEAM_ALIASES
-    name_lower = name.strip().lower()
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def _tokens(name: str) -> tuple:
+    return tuple(token for token in _TOKEN_SPLIT.split(name.lower()) if token)
+
+
+class TeamAliasIndex:
+    """
+    Precomputed lookups over one sport's alias table
+
+    exact     alias (as written, or punctuation-normalised) -> canonical
+    by_token  alias word -> positions of the aliases containing it, in
+              table order, so the partial fallback only checks aliases
+              sharing a word with the name
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]]):
+        self.exact: Dict[str, str] = {}
+        self.entries: List[tuple] = []  # (alias lower, alias words, canonical) in table order
+        self.by_token: Dict[str, List[int]] = {}
+
+        for canonical, alias_list in aliases.items():
+            for alias in alias_list:
+                alias_lower = alias.lower()
+                alias_tokens = _tokens(alias)
+
+                # First canonical listing an alias wins, as in a linear scan
+                self.exact.setdefault(alias_lower, canonical)
+                self.exact.setdefault(" ".join(alias_tokens), canonical)
 
-    for canonical, alias_list in aliases.items():
-        for alias in alias_list:
-            if alias.lower() == name_lower:
+                position = len(self.entries)
+                self.entries.append((alias_lower, frozenset(alias_tokens), canonical))
+                for token in set(alias_tokens):
+                    self.by_token.setdefault(token, []).append(position)
+
+    def lookup(self, name: str) -> Optional[str]:
+        name_lower = name.strip().lower()
+        if not name_lower:
+            return None
+
+        name_tokens = _tokens(name_lower)
+        canonical = self.exact.get(name_lower) or self.exact.get(" ".join(name_tokens))
+        if canonical:
+            return canonical
+
+        # Partial match fallback: an alias whose words are all in the name, or vice versa
+        words = frozenset(name_tokens)
+        candidates = sorted({position for token in words for position in self.by_token.get(token, ())})
+        for position in candidates:
+            _, alias_tokens, canonical = self.entries[position]
+            if alias_tokens <= words or words <= alias_tokens:
                 return canonical
 
-    # Partial match fallback
-    for canonical, alias_list in aliases.items():
-        for alias in alias_list:
-            if alias.lower() in name_lower or name_lower in alias.lower():
+        # Word fragments (e.g. "Crow"): substring scan
+        for alias_lower, _, canonical in self.entries:
+            if alias_lower in name_lower or name_lower in alias_lower:
                 return canonical
 
-    logger.warning(f"Could not match team name: '{name}' for sport: {sport}")
-    return None
+        return None
+
+
+TEAM_ALIAS_INDEXES = {
+    "afl": TeamAliasIndex(AFL_TEAM_ALIASES),
+    "nrl": TeamAliasIndex(NRL_TEAM_ALIASES),
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_team_name(name: str, sport: str) -> Optional[str]:
+    """Match a team name string to canonical team name using aliases (memoised)"""
+    index = TEAM_ALIAS_INDEXES["afl" if sport == "afl" else "nrl"]
+    canonical = index.lookup(name)
+
+    if canonical is None:
+        logger.warning(f"Could not match team name: '{name}' for sport: {sport}")
+    return canonical
 
 
 def match_team_to_match(tipped_team: str, home_team: str, away_team: str, sport: str) -> Optional[str]:
@@ -104,233 +218,524 @@ def match_team_to_match(tipped_team: str, home_team: str, away_team: str, sport:
     return None
 
 
+def _parse_date(value: Any) -> Optional[datetime]:
+    """ISO / Squiggle date string -> naive datetime (timezones only shift by hours; rematches are weeks apart)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+class TeamPairIndex:
+    """
+    Tip/forecast records grouped once by (canonical home, canonical away, game id)
+
+    Every record's team names are normalised once when the index is built,
+    so finding the records for a match is a dict access instead of a scan
+    of the whole payload. When a pairing appears in more than one game
+    (e.g. a season's rematch) the game nearest the match's start time wins.
+    """
+
+    def __init__(self, records: List[Dict], sport: str, home_key: str, away_key: str,
+                 game_key: Optional[str] = None, date_key: Optional[str] = None):
+        self.sport = sport
+        self.groups: Dict[Tuple[str, str, Any], List[Dict]] = {}
+        self._games: Dict[Tuple[str, str], Dict[Any, Optional[datetime]]] = {}
+
+        for record in records:
+            home = normalize_team_name(record.get(home_key) or "", sport)
+            away = normalize_team_name(record.get(away_key) or "", sport)
+            if not home or not away:
+                continue
+
+            game_id = record.get(game_key) if game_key else None
+            self.groups.setdefault((home, away, game_id), []).append(record)
+
+            games = self._games.setdefault((home, away), {})
+            if games.get(game_id) is None:
+                games[game_id] = _parse_date(record.get(date_key)) if date_key else None
+
+    def lookup(self, home_team: str, away_team: str, commence_time: Any = None) -> List[Dict]:
+        """
+        Records for one match, from the game nearest commence_time when the pairing repeats
+        """
+        home = normalize_team_name(home_team, self.sport)
+        away = normalize_team_name(away_team, self.sport)
+        games = self._games.get((home, away))
+        if not games:
+            return []
+
+        if len(games) == 1:
+            game_id = next(iter(games))
+        else:
+            start = _parse_date(commence_time)
+            if start is not None and all(games.values()):
+                game_id = min(games, key=lambda g: abs(games[g] - start))
+            else:
+                # No dates to compare: the latest game listed
+                game_id = list(games)[-1]
+
+        return self.groups[(home, away, game_id)]
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+
+def parse_footyforecaster(html: str, sport: str) -> List[Dict]:
+    """
+    Parse FootyForecaster round forecast page.
+    Expected format per match:
+      "Team A v Team B (Venue)"
+      "Probability" "Team A XX.X% Team B YY.Y%"
+      "Forecast" "Team by N points"
+    """
+    text = parse_html(html).text(separator='\n')
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+
+    forecasts = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        # Match pattern: "Team A v Team B (Venue)"
+        match_pattern = re.match(r'^(.+?)\s+v\s+(.+?)\s*\(', line)
+        if match_pattern:
+            home_team = match_pattern.group(1).strip()
+            away_team = match_pattern.group(2).strip()
+
+            # Look ahead for Forecast line with "by X points"
+            tipped_team = None
+            margin = None
+            for j in range(i + 1, min(i + 8, len(lines))):
+                forecast_match = re.match(r'^(.+?)\s+by\s+(\d+)\s+points?', lines[j])
+                if forecast_match:
+                    tipped_team = forecast_match.group(1).strip()
+                    margin = float(forecast_match.group(2))
+                    break
+
+            if tipped_team:
+                forecasts.append({
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "tipped_team": tipped_team,
+                    "margin": margin,
+                })
+
+        i += 1
+
+    return forecasts
+
+
+async def _gather_limited(coros, limit: int, return_exceptions: bool = False) -> List:
+    """asyncio.gather with at most `limit` coroutines running at once"""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(bounded(c) for c in coros), return_exceptions=return_exceptions)
+
+
 class SportTipsScraper:
     """Orchestrates scraping from all expert tip sources"""
 
+    def __init__(self, metrics: Optional[RunMetrics] = None):
+        self.metrics = metrics
+        self.sources = self._load_sources()
+
+        # Last run's {source: {"status", "tips", "seconds"}}
+        self.source_stats: Dict[str, Dict] = {}
+
+    def _load_sources(self) -> List[Dict]:
+        """
+        Registry of tip sources
+
+        sports       sports the source covers; it only receives those matches
+        scrape       coroutine scrape(matches, concurrency) -> tip dicts
+        timeout      seconds the source may take before it is abandoned
+        concurrency  requests/pages the source may have in flight at once
+        enabled      False skips the source (e.g. its dependencies are missing)
+        """
+        return [
+            {
+                # Stable public JSON API — most reliable
+                "name": "Squiggle",
+                "sports": {"afl"},
+                "scrape": self.scrape_squiggle,
+                "timeout": 60,
+                "concurrency": 2,  # current + next round
+                "enabled": True,
+            },
+            {
+                # Probability-based predictions, one browser page per league
+                "name": "FootyForecaster",
+                "sports": {"afl", "nrl"},
+                "scrape": self.scrape_footyforecaster,
+                "timeout": 120,
+                "concurrency": 2,
+                "enabled": PLAYWRIGHT_AVAILABLE,
+            },
+        ]
+
     async def scrape_all(self, matches: List[Dict]) -> List[Dict]:
         """
         Scrape tips from all sources for the given matches.
+        Sources run concurrently, each within its own timeout, and all of them
+        within SPORT_TIPS_DEADLINE; tips from sources that finished in time are
+        returned even when others didn't.
         matches: list of dicts with id, home_team, away_team, sport, commence_time
         Returns: list of tip dicts ready for SportExpertTip model
         """
-        all_tips = []
-
-        # Separate by sport
-        afl_matches = [m for m in matches if m["sport"] == "afl"]
-        nrl_matches = [m for m in matches if m["sport"] == "nrl"]
+        self.source_stats = {}
+        tasks = []
+        for source in self.sources:
+            source_matches = [m for m in matches if m["sport"] in source["sports"]]
+            if source["enabled"] and source_matches:
+                tasks.append(asyncio.create_task(self._run_source(source, source_matches)))
+
+        if not tasks:
+            return []
+
+        done, pending = await asyncio.wait(tasks, timeout=SPORT_TIPS_DEADLINE)
+        if pending:
+            logger.warning(f"Tip scraping deadline ({SPORT_TIPS_DEADLINE:.0f}s) reached, "
+                           f"cancelling {len(pending)} source(s)")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        all_tips = [tip for task in tasks if task in done for tip in task.result()]
+        logger.info(f"Total expert tips scraped: {len(all_tips)}")
+        return all_tips
 
-        # 1. Squiggle API (AFL only) — most reliable
-        if afl_matches:
-            try:
-                tips = await self.scrape_squiggle(afl_matches)
-                all_tips.extend(tips)
-                logger.info(f"Squiggle: {len(tips)} tips")
-            except Exception as e:
-                logger.error(f"Squiggle scraper failed: {e}")
+    async def _run_source(self, source: Dict, matches: List[Dict]) -> List[Dict]:
+        """
+        Run one source within its timeout budget, recording its latency and tip count
+        """
+        name = source["name"]
+        tips: List[Dict] = []
+        status = "ok"
+        started = time.perf_counter()
 
-        # 2. FootyForecaster (AFL + NRL) — probability-based predictions
-        if matches and PLAYWRIGHT_AVAILABLE:
+        stage = self.metrics.stage(f"tips_{name.lower()}") if self.metrics else nullcontext()
+        with stage as stage_metrics:
             try:
-                tips = await self.scrape_footyforecaster(matches)
-                all_tips.extend(tips)
-                logger.info(f"FootyForecaster: {len(tips)} tips")
+                tips = await asyncio.wait_for(
+                    source["scrape"](matches, concurrency=source["concurrency"]), timeout=source["timeout"]
+                )
+            except asyncio.TimeoutError:
+                status = "timeout"
+                logger.error(f"{name} scraper timed out after {source['timeout']}s")
+            except asyncio.CancelledError:
+                status = "deadline"
+                raise
             except Exception as e:
-                logger.error(f"FootyForecaster scraper failed: {e}")
+                status = "error"
+                logger.error(f"{name} scraper failed: {e}")
+            finally:
+                seconds = time.perf_counter() - started
+                self.source_stats[name] = {"status": status, "tips": len(tips), "seconds": round(seconds, 2)}
+                if stage_metrics is not None:
+                    stage_metrics.items = len(tips)
+                logger.info(f"{name}: {len(tips)} tips in {seconds:.1f}s ({status})")
 
-        logger.info(f"Total expert tips scraped: {len(all_tips)}")
-        return all_tips
+        return tips
 
     # ----- Squiggle API (AFL) -----
 
-    async def scrape_squiggle(self, afl_matches: List[Dict]) -> List[Dict]:
+    async def scrape_squiggle(self, afl_matches: List[Dict], concurrency: int = 2) -> List[Dict]:
         """
         Fetch AFL tips from Squiggle API (https://api.squiggle.com.au)
         This is a stable public JSON API — no scraping needed.
         """
         tips = []
         year = datetime.now().year
+        season = self._load_squiggle_season(year)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(
-                "https://api.squiggle.com.au/",
-                params={"q": "tips", "year": year},
-                headers={"User-Agent": "TippingAggregator/1.0 (contact@tippingaggregator.com)"}
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        async with httpx.AsyncClient(timeout=30, headers=SQUIGGLE_HEADERS) as client:
+            if not season["rounds"] or time.time() - season.get("updated_at", 0) > SQUIGGLE_SEASON_TTL:
+                await self._fetch_squiggle_season(client, season, year)
+            else:
+                current = self._current_squiggle_round(season)
+                rounds = (current, current + 1)
+                results = await _gather_limited(
+                    (self._fetch_squiggle_round(client, season, year, n) for n in rounds),
+                    concurrency, return_exceptions=True
+                )
+                for round_number, result in zip(rounds, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Squiggle round {round_number} refresh failed, using cache: {result}")
 
-        squiggle_tips = data.get("tips", [])
-        logger.info(f"Squiggle returned {len(squiggle_tips)} tip records")
+        self._save_squiggle_season(season, year)
+
+        squiggle_tips = [tip for entry in season["rounds"].values() for tip in entry["tips"]]
+        logger.info(f"Squiggle: {len(squiggle_tips)} tip records in {len(season['rounds'])} cached rounds")
+
+        index = TeamPairIndex(squiggle_tips, "afl", "hteam", "ateam", game_key="gameid", date_key="date")
 
         for match in afl_matches:
-            match_tips = self._match_squiggle_tips(squiggle_tips, match)
+            match_tips = self._match_squiggle_tips(index, match)
             tips.extend(match_tips)
 
         return tips
 
-    def _match_squiggle_tips(self, squiggle_tips: List[Dict], match: Dict) -> List[Dict]:
-        """Match Squiggle tips to a specific AFL match"""
-        tips = []
-        home_canonical = normalize_team_name(match["home_team"], "afl")
-        away_canonical = normalize_team_name(match["away_team"], "afl")
+    @staticmethod
+    def _squiggle_season_path(year: int) -> str:
+        return os.path.join(SQUIGGLE_CACHE_DIR, f"tips-{year}.json")
 
-        if not home_canonical or not away_canonical:
-            return tips
+    def _load_squiggle_season(self, year: int) -> Dict:
+        """
+        Load the cached season {"updated_at", "rounds": {round: {"tips", "etag", "last_modified", "fetched_at"}}}
+        """
+        path = self._squiggle_season_path(year)
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable Squiggle cache {path}: {e}")
+
+        return {"updated_at": 0, "rounds": {}}
+
+    def _save_squiggle_season(self, season: Dict, year: int):
+        path = self._squiggle_season_path(year)
+        try:
+            write_json_atomic(path, season)
+        except OSError as e:
+            logger.warning(f"Could not save Squiggle cache: {e}")
+
+    @staticmethod
+    def _current_squiggle_round(season: Dict) -> int:
+        """
+        Earliest cached round that is still open: no tips yet, or a game
+        that hasn't finished. Past the last cached round if every one is done.
+        """
+        cutoff = datetime.now() - SQUIGGLE_ROUND_GRACE
+        rounds = sorted(season["rounds"].items(), key=lambda item: int(item[0]))
 
-        for tip in squiggle_tips:
-            sq_home = tip.get("hteam", "")
-            sq_away = tip.get("ateam", "")
+        for round_number, entry in rounds:
+            dates = [_parse_date(tip.get("date")) for tip in entry["tips"]]
+            if not entry["tips"] or any(date is None or date >= cutoff for date in dates):
+                return int(round_number)
 
-            sq_home_canonical = normalize_team_name(sq_home, "afl")
-            sq_away_canonical = normalize_team_name(sq_away, "afl")
+        return int(rounds[-1][0]) + 1
 
-            if sq_home_canonical == home_canonical and sq_away_canonical == away_canonical:
-                tipped = tip.get("tip", "")
-                margin = tip.get("margin")
-                source_name = tip.get("sourcename", "Unknown")
+    async def _fetch_squiggle_season(self, client: httpx.AsyncClient, season: Dict, year: int):
+        """
+        Fetch every tip for the year and split it into cached rounds
+        """
+        resp = await client.get(SQUIGGLE_URL, params={"q": "tips", "year": year})
+        resp.raise_for_status()
+
+        rounds: Dict[str, Dict] = {}
+        fetched_at = time.time()
+        for tip in resp.json().get("tips", []):
+            entry = rounds.setdefault(str(tip.get("round")), {
+                "tips": [], "etag": None, "last_modified": None, "fetched_at": fetched_at,
+            })
+            entry["tips"].append(tip)
+
+        season["rounds"] = rounds
+        season["updated_at"] = fetched_at
+        logger.info(f"Squiggle: fetched full {year} season ({len(rounds)} rounds)")
+
+    async def _fetch_squiggle_round(self, client: httpx.AsyncClient, season: Dict, year: int, round_number: int):
+        """
+        Conditionally re-fetch one round and merge it into the season cache
+        """
+        cached = season["rounds"].get(str(round_number))
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        resp = await client.get(
+            SQUIGGLE_URL, params={"q": "tips", "year": year, "round": round_number}, headers=headers
+        )
+
+        # Timestamps only move once the round is confirmed fresh (304) or
+        # replaced (200); a failed fetch leaves the cache due for a retry
+        if resp.status_code == 304 and cached:
+            cached["fetched_at"] = season["updated_at"] = time.time()
+            logger.debug(f"Squiggle round {round_number}: not modified")
+            return
+
+        resp.raise_for_status()
+        round_tips = resp.json().get("tips", [])
+        fetched_at = time.time()
+        season["rounds"][str(round_number)] = {
+            "tips": round_tips,
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "fetched_at": fetched_at,
+        }
+        season["updated_at"] = fetched_at
+        logger.debug(f"Squiggle round {round_number}: {len(round_tips)} tips")
+
+    def _match_squiggle_tips(self, index: TeamPairIndex, match: Dict) -> List[Dict]:
+        """Match Squiggle tips to a specific AFL match"""
+        tips = []
 
-                tipped_team = match_team_to_match(tipped, match["home_team"], match["away_team"], "afl")
-                if tipped_team:
-                    tips.append({
-                        "match_id": match["id"],
-                        "source": "squiggle",
-                        "expert_name": source_name,
-                        "tipped_team": tipped_team,
-                        "predicted_margin": float(margin) if margin else None,
-                        "sport": "afl",
-                    })
+        for tip in index.lookup(match["home_team"], match["away_team"], match.get("commence_time")):
+            tipped = tip.get("tip", "")
+            margin = tip.get("margin")
+            source_name = tip.get("sourcename", "Unknown")
+
+            tipped_team = match_team_to_match(tipped, match["home_team"], match["away_team"], "afl")
+            if tipped_team:
+                tips.append({
+                    "match_id": match["id"],
+                    "source": "squiggle",
+                    "expert_name": source_name,
+                    "tipped_team": tipped_team,
+                    "predicted_margin": float(margin) if margin else None,
+                    "sport": "afl",
+                })
 
         return tips
 
     # ----- FootyForecaster (AFL + NRL) -----
 
-    async def scrape_footyforecaster(self, matches: List[Dict]) -> List[Dict]:
+    async def scrape_footyforecaster(self, matches: List[Dict], concurrency: int = 2) -> List[Dict]:
         """
         Scrape predictions from FootyForecaster.com for both AFL and NRL.
         Returns one tip per match with probability and predicted margin.
+        Leagues are scraped concurrently (up to `concurrency`), each in its own page.
         """
-        tips = []
-        sports_needed = set(m["sport"] for m in matches)
+        sports_needed = sorted(set(m["sport"] for m in matches))
+
+        async with get_browser_service().context() as context:
+            results = await _gather_limited(
+                (
+                    self._scrape_footyforecaster_league(
+                        context, sport, [m for m in matches if m["sport"] == sport]
+                    )
+                    for sport in sports_needed
+                ),
+                concurrency
+            )
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        return [tip for league_tips in results for tip in league_tips]
 
-            for sport in sports_needed:
-                sport_matches = [m for m in matches if m["sport"] == sport]
-                league = "AFL" if sport == "afl" else "NRL"
-                url = f"https://footyforecaster.com/{league}/RoundForecast"
+    async def _scrape_footyforecaster_league(self, context, sport: str, sport_matches: List[Dict]) -> List[Dict]:
+        """Scrape one league's round forecast page and match it to our matches"""
+        tips = []
+        league = "AFL" if sport == "afl" else "NRL"
+        url = f"https://footyforecaster.com/{league}/RoundForecast"
+
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=20000)
+
+            # Find and click the current/upcoming round link
+            round_link = await self._find_current_round(page, league)
+            if round_link is None:
+                return tips
+            await self._open_round(page, league, round_link)
+
+            content = await page.content()
+            forecasts = await run_parser(parse_footyforecaster, content, sport)
+            logger.info(f"FootyForecaster {league}: parsed {len(forecasts)} forecasts")
+
+            # Match forecasts to our matches
+            index = TeamPairIndex(forecasts, sport, "home_team", "away_team")
+            for match in sport_matches:
+                for forecast in index.lookup(match["home_team"], match["away_team"])[:1]:
+                    tips.append({
+                        "match_id": match["id"],
+                        "source": "footyforecaster",
+                        "expert_name": "FootyForecaster Model",
+                        "tipped_team": match_team_to_match(
+                            forecast["tipped_team"], match["home_team"], match["away_team"], sport
+                        ) or forecast["tipped_team"],
+                        "predicted_margin": forecast.get("margin"),
+                        "sport": sport,
+                    })
 
-                page = await browser.new_page()
-                try:
-                    await page.goto(url, wait_until="networkidle", timeout=20000)
-                    await asyncio.sleep(1)
-
-                    # Find and click the current/upcoming round link
-                    round_link = await self._find_current_round(page, league)
-                    if round_link:
-                        await round_link.click()
-                        await asyncio.sleep(2)
-
-                    content = await page.content()
-                    forecasts = self._parse_footyforecaster(content, sport)
-                    logger.info(f"FootyForecaster {league}: parsed {len(forecasts)} forecasts")
-
-                    # Match forecasts to our matches
-                    for forecast in forecasts:
-                        for match in sport_matches:
-                            home_canonical = normalize_team_name(match["home_team"], sport)
-                            ff_home_canonical = normalize_team_name(forecast["home_team"], sport)
-                            ff_away_canonical = normalize_team_name(forecast["away_team"], sport)
-                            away_canonical = normalize_team_name(match["away_team"], sport)
-
-                            if ff_home_canonical == home_canonical and ff_away_canonical == away_canonical:
-                                tips.append({
-                                    "match_id": match["id"],
-                                    "source": "footyforecaster",
-                                    "expert_name": "FootyForecaster Model",
-                                    "tipped_team": match_team_to_match(
-                                        forecast["tipped_team"], match["home_team"], match["away_team"], sport
-                                    ) or forecast["tipped_team"],
-                                    "predicted_margin": forecast.get("margin"),
-                                    "sport": sport,
-                                })
-                                break
-
-                except Exception as e:
-                    logger.error(f"Error scraping FootyForecaster {league}: {e}")
-                finally:
-                    await page.close()
-
-            await browser.close()
+        except Exception as e:
+            logger.error(f"Error scraping FootyForecaster {league}: {e}")
+        finally:
+            await page.close()
 
         return tips
 
-    async def _find_current_round(self, page, league: str):
-        """Find and return the link element for the current/nearest round."""
-        year = datetime.now().year
-
-        # Try common round name patterns
-        round_names = [
-            f"{year} Opening Round",
-            f"{year} Round 0",
-            f"{year} Round 1",
-        ]
-
-        # Also try to find the round that's closest to now
-        for i in range(24, 0, -1):
-            round_names.append(f"{year} Round {i}")
-
-        for name in round_names:
-            try:
-                link = page.locator(f"text={name}").first
-                if await link.is_visible(timeout=500):
-                    return link
-            except Exception:
-                continue
-
-        return None
+    async def _find_current_round(self, page, league: str) -> Optional[Dict]:
+        """
+        The current/nearest round link, as read by _ROUND_LINKS_JS.
+        All candidate links are read in a single DOM evaluation.
+        """
+        links = await page.eval_on_selector_all(ROUND_LINK_SELECTOR, _ROUND_LINKS_JS)
+        index = self._choose_round(links, datetime.now())
+        if index is None:
+            logger.warning(f"FootyForecaster {league}: no dated round link found, skipping league")
+            return None
+        return links[index]
+
+    async def _open_round(self, page, league: str, link: Dict):
+        """
+        Click a round link and wait until the round's content is showing
 
-    def _parse_footyforecaster(self, html: str, sport: str) -> List[Dict]:
+        Links with a real href navigate, so the click is wrapped in
+        expect_navigation. Anything else is a client-side switch: wait for
+        the page text to change. If it doesn't change in time the page was
+        most likely already showing that round.
         """
-        Parse FootyForecaster round forecast page.
-        Expected format per match:
-          "Team A v Team B (Venue)"
-          "Probability" "Team A XX.X% Team B YY.Y%"
-          "Forecast" "Team by N points"
+        locator = page.locator(ROUND_LINK_SELECTOR).nth(link["index"])
+        href = link.get("href") or ""
+
+        if href and not href.startswith(("#", "javascript:")):
+            async with page.expect_navigation(wait_until="networkidle", timeout=20000):
+                await locator.click()
+            return
+
+        before = await page.evaluate(_PAGE_TEXT_JS)
+        await locator.click()
+        try:
+            await page.wait_for_function(_TEXT_CHANGED_JS, arg=before, timeout=10000)
+        except PlaywrightTimeoutError:
+            logger.debug(f"FootyForecaster {league}: page unchanged after clicking '{link['text']}'")
+
+    @staticmethod
+    def _choose_round(links: List[Dict], now: datetime) -> Optional[int]:
         """
-        soup = BeautifulSoup(html, "lxml")
-        text = soup.get_text(separator='\n')
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-
-        forecasts = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Match pattern: "Team A v Team B (Venue)"
-            match_pattern = re.match(r'^(.+?)\s+v\s+(.+?)\s*\(', line)
-            if match_pattern:
-                home_team = match_pattern.group(1).strip()
-                away_team = match_pattern.group(2).strip()
-
-                # Look ahead for Forecast line with "by X points"
-                tipped_team = None
-                margin = None
-                for j in range(i + 1, min(i + 8, len(lines))):
-                    forecast_match = re.match(r'^(.+?)\s+by\s+(\d+)\s+points?', lines[j])
-                    if forecast_match:
-                        tipped_team = forecast_match.group(1).strip()
-                        margin = float(forecast_match.group(2))
-                        break
-
-                if tipped_team:
-                    forecasts.append({
-                        "home_team": home_team,
-                        "away_team": away_team,
-                        "tipped_team": tipped_team,
-                        "margin": margin,
-                    })
+        Pick the round link nearest to now
+
+        links: [{"index", "text", "context", "visible"}] from _ROUND_LINKS_JS.
+        Rounds with dates in their link/row text are ranked by distance from
+        now, preferring rounds that haven't finished. Returns None when no
+        round has a parseable date: guessing would risk matching another
+        round's forecasts to this round's games.
+        """
+        year = now.year
+        rounds = {}  # round number -> (link index, dates)
+        for link in links:
+            label = ROUND_LABEL.match(link.get("text") or "")
+            if not link.get("visible") or not label or int(label.group(1)) != year:
+                continue
 
-            i += 1
+            number = -1 if label.group(2) is None else int(label.group(2))  # -1: Opening Round
+            if number in rounds:
+                continue
 
-        return forecasts
+            dates = []
+            for day, month in ROUND_DATE.findall(link.get("context") or ""):
+                try:
+                    dates.append(datetime(year, _MONTHS[month[:3].lower()], int(day)))
+                except ValueError:
+                    continue
+            rounds[number] = (link["index"], dates)
+
+        dated = {number: dates for number, (_, dates) in rounds.items() if dates}
+        if not dated:
+            return None
+
+        def distance(number):
+            start, end = min(dated[number]), max(dated[number]) + timedelta(days=1)
+            finished = end < now
+            gap = timedelta(0) if start <= now <= end else min(abs(start - now), abs(end - now))
+            return finished, gap
+        return rounds[min(dated, key=distance)][0]
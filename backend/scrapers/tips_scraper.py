@@ -6,18 +6,234 @@ Scrapes expert tips from public Australian racing websites:
 - Sky Racing
 - Other configured sources
 
-Uses Playwright for JavaScript-rendered content
+Uses Playwright for JavaScript-rendered content, on the process-wide warm
+browser (see utils/browser_service.py). Sources are scraped concurrently
+(up to MAX_CONCURRENT_SCRAPES), each in its own browser context, with
+SCRAPE_DELAY_SECONDS enforced per domain.
+
+Pages load with a per-source scraping profile: non-essential resource
+types and third-party hosts are aborted, and a page counts as ready as
+soon as the source's tip selector appears.
+
+Sources whose tips are rendered server-side skip the browser entirely and
+are fetched with a pooled httpx client. With the default "auto" fetch
+strategy each source is probed once: if its tip selector is present in
+the raw HTML it is fetched statically from then on, otherwise through
+Playwright. Both paths feed the same parsers, which run in the shared
+parsing pool (see utils/parse_pool.py) and return plain tip dicts.
 """
 
 import os
+import json
+import time
 import asyncio
-from typing import List, Dict
-from playwright.async_api import async_playwright, Page, Browser
+import httpx
+from typing import List, Dict, Optional
+from playwright.async_api import Page, BrowserContext, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 from models.database import ExpertTip
+from utils.politeness import DomainThrottle
+from utils.atomic_file import write_json_atomic
+from utils.browser_service import get_browser_service
+from utils.race_index import RaceIndex
+from utils.parse_pool import run_parser
+from utils.html_parser import parse_html
+
+# Fast page loads: abort non-essential requests (set SCRAPE_BLOCK_RESOURCES=false to disable)
+BLOCK_RESOURCES = os.getenv("SCRAPE_BLOCK_RESOURCES", "true").lower() == "true"
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Ad/analytics hosts, aborted even for sources that allow third-party requests
+BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "facebook.net",
+    "hotjar.com",
+    "newrelic.com",
+    "nr-data.net",
+    "scorecardresearch.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+# How long to wait for a source's tip selector before parsing what loaded (ms)
+READY_TIMEOUT_MS = int(os.getenv("SCRAPE_READY_TIMEOUT_MS", 15000))
+NAVIGATION_TIMEOUT_MS = 30000
+
+# Fetch strategy per source: auto (probe), static (httpx only) or browser (Playwright only)
+FETCH_STRATEGY = os.getenv("SCRAPE_FETCH_STRATEGY", "auto")
+
+# Remembered probe results, re-probed after the TTL (seconds)
+STRATEGY_FILE = os.getenv("SCRAPE_STRATEGY_FILE", "cache/scrape_strategies.json")
+STRATEGY_TTL = float(os.getenv("SCRAPE_STRATEGY_TTL", 86400))
+
+STATIC_TIMEOUT = 20.0
+STATIC_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/121.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-AU,en;q=0.9",
+}
+
+
+def _host_matches(host: str, domains) -> bool:
+    """Whether host is one of domains or a subdomain of one"""
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+# Parsers run in the parse pool (utils/parse_pool.py), so they are module-level
+# functions taking HTML and returning plain dicts
+
+def has_tips(html: str, selector: str) -> bool:
+    """
+    Whether the source's tip selector is present in the HTML
+    """
+    return parse_html(html).select_one(selector) is not None
+
+
+def parse_racing_com(
+    html: str,
+    index: RaceIndex,
+    source_name: str
+) -> List[Dict]:
+    """
+    Parse tips from Racing.com
+
+    Note: This is a template. Actual selectors need to be verified
+    against the live site structure.
+    """
+    tips = []
+    doc = parse_html(html)
+
+    try:
+        # Find tip sections
+        # NOTE: These selectors are EXAMPLES - adjust based on actual site structure
+        tip_sections = doc.select('.tip-section, .expert-tip, .race-tip')
+
+        for section in tip_sections:
+            # Extract venue and race number
+            venue_elem = section.select_one('.venue, .track-name')
+            race_elem = section.select_one('.race-number')
+
+            if not venue_elem or not race_elem:
+                continue
+
+            venue = venue_elem.text().strip()
+            race_num_text = race_elem.text().strip()
+            race_number = int(''.join(filter(str.isdigit, race_num_text)))
+
+            # Find matching race
+            race = index.find_race(venue, race_number)
+            if not race:
+                continue
+
+            # Extract tips
+            runner_tips = section.select('.runner-tip, .selection')
+
+            for runner_tip in runner_tips:
+                runner_name_elem = runner_tip.select_one('.runner-name, .horse-name')
+                comment_elem = runner_tip.select_one('.comment, .tip-text')
+
+                if not runner_name_elem:
+                    continue
+
+                runner_name = runner_name_elem.text().strip()
+                comment = comment_elem.text().strip() if comment_elem else "No comment provided"
+
+                # Find runner number
+                runner_number = index.find_runner_number(race, runner_name)
+                if not runner_number:
+                    continue
+
+                tip = dict(
+                    race_id=race.id,
+                    runner_name=runner_name,
+                    runner_number=runner_number,
+                    source=source_name,
+                    expert_name="Racing.com Tips",
+                    confidence_score=0,  # Will be set by AI analyzer
+                    category="neutral",  # Will be set by AI analyzer
+                    raw_text=comment
+                )
+
+                tips.append(tip)
+
+    except Exception as e:
+        logger.error(f"Error parsing Racing.com: {e}", exc_info=True)
+
+    return tips
+
+
+def parse_sky_racing(
+    html: str,
+    index: RaceIndex,
+    source_name: str
+) -> List[Dict]:
+    """
+    Parse tips from Sky Racing
+
+    Note: This is a template. Actual selectors need to be verified.
+    """
+    tips = []
+    doc = parse_html(html)
+
+    try:
+        # Similar structure to Racing.com but with different selectors
+        # NOTE: These selectors are EXAMPLES
+        tip_cards = doc.select('.tip-card, .expert-selection')
+
+        for card in tip_cards:
+            # Extract race info
+            venue_elem = card.select_one('.venue-name')
+            race_elem = card.select_one('.race-num')
+
+            if not venue_elem or not race_elem:
+                continue
+
+            venue = venue_elem.text().strip()
+            race_number = int(''.join(filter(str.isdigit, race_elem.text())))
+
+            # Find matching race
+            race = index.find_race(venue, race_number)
+            if not race:
+                continue
+
+            # Extract tips
+            selections = card.select('.selection-item')
+
+            for selection in selections:
+                runner_name = selection.select_one('.horse').text().strip()
+                tip_text = selection.select_one('.analysis').text().strip()
+
+                runner_number = index.find_runner_number(race, runner_name)
+                if not runner_number:
+                    continue
+
+                tip = dict(
+                    race_id=race.id,
+                    runner_name=runner_name,
+                    runner_number=runner_number,
+                    source=source_name,
+                    expert_name="Sky Racing Tips",
+                    confidence_score=0,
+                    category="neutral",
+                    raw_text=tip_text
+                )
+
+                tips.append(tip)
+
+    except Exception as e:
+        logger.error(f"Error parsing Sky Racing: {e}", exc_info=True)
+
+    return tips
+
 
 class TipsScraper:
     """
@@ -29,6 +245,20 @@ class TipsScraper:
         self.max_concurrent = int(os.getenv("MAX_CONCURRENT_SCRAPES", 3))
         self.delay = float(os.getenv("SCRAPE_DELAY_SECONDS", 2))
 
+        # Politeness delay between requests to the same domain
+        self.throttle = DomainThrottle(self.delay)
+
+        # Warm browser shared with the other scrapers in this process
+        self.browsers = get_browser_service()
+
+        # Pooled client for static sources, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+        self.strategies = self._load_strategies()
+
+        # Stats
+        self.static_fetches = 0
+        self.browser_fetches = 0
+
     def _load_sources(self) -> List[Dict]:
         """
         Load scraping targets from environment
@@ -41,268 +271,306 @@ class TipsScraper:
         sources = []
         for url in targets_str.split(","):
             url = url.strip()
-            if "racing.com" in url:
+            # Check skyracing first: "skyracing.com.au" also contains "racing.com"
+            if "skyracing" in url:
                 sources.append({
-                    "name": "Racing.com",
+                    "name": "Sky Racing",
                     "url": url,
-                    "parser": self._parse_racing_com
+                    "parser": parse_sky_racing,
+                    "ready_selector": ".tip-card, .expert-selection",
                 })
-            elif "skyracing" in url:
+            elif "racing.com" in url:
                 sources.append({
-                    "name": "Sky Racing",
+                    "name": "Racing.com",
                     "url": url,
-                    "parser": self._parse_sky_racing
+                    "parser": parse_racing_com,
+                    "ready_selector": ".tip-section, .expert-tip, .race-tip",
                 })
 
         return sources
 
-    async def scrape_all_sources(self, races: List) -> List[ExpertTip]:
+    async def aclose(self):
         """
-        Scrape tips from all configured sources
+        Close the pooled HTTP client
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
-        Args:
-            races: List of Race objects to match tips against
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "static_fetches": self.static_fetches,
+            "browser_fetches": self.browser_fetches,
+            "throttle": self.throttle.stats(),
+        }
 
-        Returns:
-            List of ExpertTip objects
+    def _load_strategies(self) -> Dict[str, Dict]:
         """
-        all_tips = []
+        Load remembered fetch strategies {url: {"strategy", "probed_at"}}
+        """
+        if not STRATEGY_FILE or not os.path.exists(STRATEGY_FILE):
+            return {}
 
-        async with async_playwright() as playwright:
-            browser = await playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
+        try:
+            with open(STRATEGY_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scrape strategy file: {e}")
+            return {}
 
-            try:
-                for source in self.sources:
-                    logger.info(f"Scraping {source['name']}...")
+    def _remember_strategy(self, source: Dict, strategy: str):
+        """
+        Record a source's probed fetch strategy
+        """
+        previous = self.strategies.get(source['url'], {}).get("strategy")
+        self.strategies[source['url']] = {"strategy": strategy, "probed_at": time.time()}
 
-                    try:
-                        tips = await self._scrape_source(browser, source, races)
-                        all_tips.extend(tips)
-                        logger.info(f"✓ Scraped {len(tips)} tips from {source['name']}")
+        if previous != strategy:
+            logger.info(f"{source['name']}: using {strategy} fetches")
 
-                    except Exception as e:
-                        logger.error(f"Error scraping {source['name']}: {e}", exc_info=True)
-                        continue
+        if not STRATEGY_FILE:
+            return
 
-                    # Rate limiting
-                    await asyncio.sleep(self.delay)
+        try:
+            write_json_atomic(STRATEGY_FILE, self.strategies)
+        except OSError as e:
+            logger.warning(f"Could not save scrape strategies: {e}")
 
-            finally:
-                await browser.close()
+    def _fetch_strategy(self, source: Dict) -> str:
+        """
+        static, browser, or auto when the source needs (re-)probing
+        """
+        configured = source.get("fetch", FETCH_STRATEGY)
+        if configured != "auto":
+            return configured
 
-        return all_tips
+        # Without a selector there's nothing to probe for
+        if not source.get("ready_selector"):
+            return "browser"
 
-    async def _scrape_source(
-        self,
-        browser: Browser,
-        source: Dict,
-        races: List
-    ) -> List[ExpertTip]:
+        remembered = self.strategies.get(source['url'])
+        if remembered and time.time() - remembered.get("probed_at", 0) < STRATEGY_TTL:
+            return remembered["strategy"]
+
+        return "auto"
+
+    @staticmethod
+    def _scraping_profile(source: Dict) -> Dict:
         """
-        Scrape tips from a single source
+        Page-load profile for a source; each key can be overridden in the source dict
+
+        blocked_resource_types  resource types aborted before they load
+        block_third_party       abort requests to hosts outside allowed_domains
+        allowed_domains         first-party domains (default: the source's own)
+        ready_selector          selector whose appearance means the tips have
+                                rendered; None falls back to networkidle + 2s
         """
-        page = await browser.new_page()
+        return {
+            "blocked_resource_types": source.get(
+                "blocked_resource_types",
+                BLOCKED_RESOURCE_TYPES if BLOCK_RESOURCES else set()
+            ),
+            "block_third_party": source.get("block_third_party", BLOCK_RESOURCES),
+            "allowed_domains": source.get("allowed_domains", [DomainThrottle.domain(source['url'])]),
+            "ready_selector": source.get("ready_selector"),
+        }
 
-        try:
-            # Navigate to page
-            await page.goto(source['url'], wait_until='networkidle', timeout=30000)
+    async def scrape_all_sources(self, races: List) -> List[ExpertTip]:
+        """
+        Scrape tips from all configured sources
 
-            # Wait for content to load
-            await page.wait_for_timeout(2000)
+        Sources are scraped concurrently, bounded by MAX_CONCURRENT_SCRAPES;
+        a failing source doesn't affect the others.
+
+        Args:
+            races: List of Race objects to match tips against
 
-            # Get page HTML
-            html = await page.content()
+        Returns:
+            List of ExpertTip objects, in source order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
 
-            # Parse with source-specific parser
-            tips = await source['parser'](html, races, source['name'])
+        # Built once and shared by every parser
+        index = RaceIndex(races)
 
-            return tips
+        results = await asyncio.gather(*(
+            self._scrape_source_bounded(source, index, semaphore)
+            for source in self.sources
+        ))
 
-        finally:
-            await page.close()
+        return [tip for tips in results for tip in tips]
 
-    async def _parse_racing_com(
+    async def _scrape_source_bounded(
         self,
-        html: str,
-        races: List,
-        source_name: str
+        source: Dict,
+        index: RaceIndex,
+        semaphore: asyncio.Semaphore
     ) -> List[ExpertTip]:
         """
-        Parse tips from Racing.com
-
-        Note: This is a template. Actual selectors need to be verified
-        against the live site structure.
+        Scrape one source within the concurrency limit, logging failures
         """
-        tips = []
-        soup = BeautifulSoup(html, 'lxml')
+        async with semaphore:
+            logger.info(f"Scraping {source['name']}...")
 
-        try:
-            # Find tip sections
-            # NOTE: These selectors are EXAMPLES - adjust based on actual site structure
-            tip_sections = soup.select('.tip-section, .expert-tip, .race-tip')
-
-            for section in tip_sections:
-                # Extract venue and race number
-                venue_elem = section.select_one('.venue, .track-name')
-                race_elem = section.select_one('.race-number')
-
-                if not venue_elem or not race_elem:
-                    continue
-
-                venue = venue_elem.text.strip()
-                race_num_text = race_elem.text.strip()
-                race_number = int(''.join(filter(str.isdigit, race_num_text)))
+            try:
+                tips = await self._scrape_source(source, index)
+                logger.info(f"✓ Scraped {len(tips)} tips from {source['name']}")
+                return tips
 
-                # Find matching race
-                race = self._find_race(races, venue, race_number)
-                if not race:
-                    continue
+            except Exception as e:
+                logger.error(f"Error scraping {source['name']}: {e}", exc_info=True)
+                return []
 
-                # Extract tips
-                runner_tips = section.select('.runner-tip, .selection')
+    async def _scrape_source(
+        self,
+        source: Dict,
+        index: RaceIndex
+    ) -> List[ExpertTip]:
+        """
+        Scrape tips from a single source
+        """
+        html = await self._fetch_html(source)
 
-                for runner_tip in runner_tips:
-                    runner_name_elem = runner_tip.select_one('.runner-name, .horse-name')
-                    comment_elem = runner_tip.select_one('.comment, .tip-text')
+        # Parse with source-specific parser, off the event loop
+        tip_dicts = await run_parser(source['parser'], html, index, source['name'])
 
-                    if not runner_name_elem:
-                        continue
+        return [ExpertTip(**tip) for tip in tip_dicts]
 
-                    runner_name = runner_name_elem.text.strip()
-                    comment = comment_elem.text.strip() if comment_elem else "No comment provided"
+    async def _fetch_html(self, source: Dict) -> str:
+        """
+        Fetch a source's HTML statically when its tips are server-rendered,
+        otherwise through the browser
+        """
+        strategy = self._fetch_strategy(source)
 
-                    # Find runner number
-                    runner_number = self._find_runner_number(race, runner_name)
-                    if not runner_number:
-                        continue
+        if strategy != "browser":
+            html = await self._fetch_static(source)
 
-                    tip = ExpertTip(
-                        race_id=race.id,
-                        runner_name=runner_name,
-                        runner_number=runner_number,
-                        source=source_name,
-                        expert_name="Racing.com Tips",
-                        confidence_score=0,  # Will be set by AI analyzer
-                        category="neutral",  # Will be set by AI analyzer
-                        raw_text=comment
-                    )
+            # Configured as static: never fall back to the browser
+            if source.get("fetch", FETCH_STRATEGY) == "static":
+                return html or ""
 
-                    tips.append(tip)
+            if html is not None and await run_parser(has_tips, html, source['ready_selector']):
+                self._remember_strategy(source, "static")
+                return html
 
-        except Exception as e:
-            logger.error(f"Error parsing Racing.com: {e}", exc_info=True)
+            # Probe failed, or a static source started rendering client-side
+            self._remember_strategy(source, "browser")
 
-        return tips
+        return await self._fetch_browser(source)
 
-    async def _parse_sky_racing(
-        self,
-        html: str,
-        races: List,
-        source_name: str
-    ) -> List[ExpertTip]:
+    async def _fetch_static(self, source: Dict) -> Optional[str]:
         """
-        Parse tips from Sky Racing
-
-        Note: This is a template. Actual selectors need to be verified.
+        Plain GET with the pooled client, or None on failure
         """
-        tips = []
-        soup = BeautifulSoup(html, 'lxml')
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                headers=STATIC_HEADERS,
+                timeout=STATIC_TIMEOUT,
+                follow_redirects=True
+            )
+
+        # Rate limiting (per domain)
+        await self.throttle.wait(source['url'])
 
         try:
-            # Similar structure to Racing.com but with different selectors
-            # NOTE: These selectors are EXAMPLES
-            tip_cards = soup.select('.tip-card, .expert-selection')
+            response = await self._http.get(source['url'])
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Static fetch of {source['name']} failed: {e}")
+            return None
 
-            for card in tip_cards:
-                # Extract race info
-                venue_elem = card.select_one('.venue-name')
-                race_elem = card.select_one('.race-num')
+        self.static_fetches += 1
+        return response.text
 
-                if not venue_elem or not race_elem:
-                    continue
+    async def _fetch_browser(self, source: Dict) -> str:
+        """
+        Render a source in its own browser context
+        """
+        # Rate limiting (per domain)
+        await self.throttle.wait(source['url'])
 
-                venue = venue_elem.text.strip()
-                race_number = int(''.join(filter(str.isdigit, race_elem.text)))
+        # Isolated context per source: no shared cookies, cache or storage
+        async with self.browsers.context() as context:
+            await self._block_requests(context, source)
+            page = await context.new_page()
 
-                # Find matching race
-                race = self._find_race(races, venue, race_number)
-                if not race:
-                    continue
+            # Navigate and wait for the tips to render
+            html = await self._load_page(page, source)
 
-                # Extract tips
-                selections = card.select('.selection-item')
+        self.browser_fetches += 1
+        return html
 
-                for selection in selections:
-                    runner_name = selection.select_one('.horse').text.strip()
-                    tip_text = selection.select_one('.analysis').text.strip()
+    async def _block_requests(self, context: BrowserContext, source: Dict):
+        """
+        Abort requests the source doesn't need
+        """
+        profile = self._scraping_profile(source)
 
-                    runner_number = self._find_runner_number(race, runner_name)
-                    if not runner_number:
-                        continue
+        blocked_types = profile["blocked_resource_types"]
+        block_third_party = profile["block_third_party"]
+        allowed_domains = profile["allowed_domains"]
 
-                    tip = ExpertTip(
-                        race_id=race.id,
-                        runner_name=runner_name,
-                        runner_number=runner_number,
-                        source=source_name,
-                        expert_name="Sky Racing Tips",
-                        confidence_score=0,
-                        category="neutral",
-                        raw_text=tip_text
-                    )
+        if not blocked_types and not block_third_party:
+            return
 
-                    tips.append(tip)
+        async def handle(route: Route):
+            request = route.request
+            host = DomainThrottle.domain(request.url)
 
-        except Exception as e:
-            logger.error(f"Error parsing Sky Racing: {e}", exc_info=True)
+            if (
+                request.resource_type in blocked_types
+                or _host_matches(host, BLOCKED_DOMAINS)
+                or (block_third_party and not _host_matches(host, allowed_domains))
+            ):
+                await route.abort()
+            else:
+                await route.continue_()
 
-        return tips
+        await context.route("**/*", handle)
 
-    def _find_race(self, races: List, venue: str, race_number: int):
+    async def _load_page(self, page: Page, source: Dict) -> str:
         """
-        Find a race by venue and race number
+        Navigate to a source and return its HTML once the tips are ready
         """
-        venue_normalized = venue.lower().strip()
-
-        for race in races:
-            if race.race_number == race_number:
-                if venue_normalized in race.venue.lower():
-                    return race
-
-        return None
+        ready_selector = self._scraping_profile(source)["ready_selector"]
 
-    def _find_runner_number(self, race, runner_name: str) -> int:
-        """
-        Find runner number by name
-        """
-        name_normalized = runner_name.lower().strip()
+        if not ready_selector:
+            await page.goto(source['url'], wait_until='networkidle', timeout=NAVIGATION_TIMEOUT_MS)
+            await page.wait_for_timeout(2000)
+            return await page.content()
 
-        for runner in race.runners:
-            if name_normalized in runner.name.lower():
-                return runner.number
+        await page.goto(source['url'], wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT_MS)
+        try:
+            await page.wait_for_selector(ready_selector, state='attached', timeout=READY_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            logger.warning(f"{source['name']}: '{ready_selector}' not found after {READY_TIMEOUT_MS}ms")
 
-        return None
+        return await page.content()
 
     async def scrape_with_retry(
         self,
-        browser: Browser,
         url: str,
-        max_retries: int = 3
+        max_retries: int = 3,
+        source: Optional[Dict] = None
     ) -> str:
         """
         Scrape a page with retry logic
+
+        Uses the source's scraping profile when given; otherwise blocks
+        non-essential resources and waits for networkidle.
         """
+        source = {**(source or {"name": url}), "url": url}
+
         for attempt in range(max_retries):
             try:
-                page = await browser.new_page()
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                await page.wait_for_timeout(2000)
-                html = await page.content()
-                await page.close()
-                return html
+                async with self.browsers.context() as context:
+                    await self._block_requests(context, source)
+                    page = await context.new_page()
+                    return await self._load_page(page, source)
 
             except Exception as e:
                 logger.warning(f"Scrape attempt {attempt + 1} failed: {e}")
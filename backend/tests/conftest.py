@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Add backend directory to path for imports, as the workers do
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,166 @@
+"""
+Streaming pipeline overlap and shard hand-offs, run against in-memory
+fakes of the API, DB, Claude and tip scraper
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models.database import ExpertTip, Meet, Race, Runner
+from utils.response_cache import json_default
+from workers import aggregator
+
+MEETS = 3
+RACES_PER_MEET = 4
+QUEUE_SIZE = 2  # far fewer slots than races, so a blocked put shows
+SCRAPE_SECONDS = 0.5
+
+
+def make_race(meet_id: str, race_number: int) -> Race:
+    return Race(
+        id=f"{meet_id}-{race_number}",
+        meet_id=meet_id,
+        venue=meet_id,
+        race_number=race_number,
+        start_time=datetime.now(timezone.utc) + timedelta(hours=1, minutes=race_number),
+        runners=[Runner(number=1, name="Alpha"), Runner(number=2, name="Bravo")],
+    )
+
+
+def make_meets():
+    return [Meet(id=f"m{i}", date="2026-10-16", venue=f"Venue {i}", region="VIC") for i in range(MEETS)]
+
+
+class FakeRacingAPI:
+    def __init__(self, *args, **kwargs):
+        self.details_fetched = 0
+        self.list_calls = 0
+
+    async def get_todays_meets(self):
+        self.list_calls += 1
+        return make_meets()
+
+    async def get_races_for_meet(self, meet_id):
+        self.list_calls += 1
+        return [make_race(meet_id, n) for n in range(1, RACES_PER_MEET + 1)]
+
+    async def get_race_details(self, meet_id, race_number, skip_unchanged=False):
+        await asyncio.sleep(0.001)
+        self.details_fetched += 1
+        race = make_race(meet_id, race_number)
+        for runner in race.runners:
+            runner.odds = {"tab": 2.0 + runner.number}
+        return race
+
+    def commit_race(self, race_id):
+        pass
+
+    def race_fingerprint(self, race_id):
+        return f"odds-{race_id}"
+
+    def save_fingerprints(self):
+        pass
+
+
+class FakeTipsScraper:
+    """Slow scraper that records how many odds fetches finished while it ran"""
+
+    def __init__(self):
+        self.racing_api = None
+        self.odds_fetched_while_scraping = None
+
+    async def scrape_all_sources(self, races):
+        await asyncio.sleep(SCRAPE_SECONDS)
+        self.odds_fetched_while_scraping = self.racing_api.details_fetched
+        return [
+            ExpertTip(race_id=race.id, runner_name="Alpha", runner_number=1, source="Racing.com",
+                      confidence_score=0, category="neutral", raw_text=f"Alpha to win {race.id}")
+            for race in races
+        ]
+
+
+class FakeClaude:
+    async def analyze_tip(self, tip):
+        return {"confidence_score": 70, "category": "value", "summary": "Solid"}
+
+    async def generate_verdict(self, **kwargs):
+        return "Verdict"
+
+
+class FakeDB:
+    async def upsert_meet(self, meet):
+        pass
+
+    async def upsert_race(self, race):
+        pass
+
+    async def save_odds(self, odds):
+        return {}
+
+    async def save_expert_tip(self, tip):
+        pass
+
+    async def get_best_odds(self, race_id, runner_number):
+        return {"odds": 3.0, "bookmaker": "tab"}
+
+    async def save_consensus_score(self, consensus):
+        pass
+
+    async def get_tips_for_runner(self, race_id, runner_number):
+        return []
+
+    async def update_consensus_verdict(self, *args):
+        pass
+
+
+@pytest.fixture
+def make_aggregator(monkeypatch):
+    monkeypatch.setattr(aggregator, "RacingAPIClient", FakeRacingAPI)
+    monkeypatch.setattr(aggregator, "TipsScraper", FakeTipsScraper)
+    monkeypatch.setattr(aggregator, "ClaudeAnalyzer", FakeClaude)
+    monkeypatch.setattr(aggregator, "SupabaseClient", FakeDB)
+    monkeypatch.setattr(aggregator, "CHECKPOINT_DB", "")
+    monkeypatch.setattr(aggregator, "RACE_INPUTS_FILE", "")
+    monkeypatch.setattr(aggregator, "METRICS_DIR", "")
+    monkeypatch.setattr(aggregator, "PIPELINE_QUEUE_SIZE", QUEUE_SIZE)
+
+    def make(**kwargs):
+        racing_aggregator = aggregator.RacingAggregator(**kwargs)
+        racing_aggregator.tips_scraper.racing_api = racing_aggregator.racing_api
+        return racing_aggregator
+
+    return make
+
+
+def test_odds_keep_flowing_while_tips_are_scraped(make_aggregator):
+    racing_aggregator = make_aggregator()
+    counts = asyncio.run(racing_aggregator._run_pipeline())
+
+    total = MEETS * RACES_PER_MEET
+    assert racing_aggregator.tips_scraper.odds_fetched_while_scraping == total
+    assert counts["races"] == counts["changed"] == total
+    assert counts["analyzed"] == counts["consensus"] == total
+    assert counts["verdicts"] == total
+
+
+
+def test_shard_reads_supervisor_race_lists(make_aggregator, tmp_path):
+    races_file = tmp_path / "shard_races.json"
+    payload = [
+        {"meet": meet.dict(), "races": [make_race(meet.id, n).dict() for n in range(1, RACES_PER_MEET + 1)]}
+        for meet in make_meets()
+    ]
+    races_file.write_text(json.dumps(payload, default=json_default))
+
+    racing_aggregator = make_aggregator(races_file=str(races_file))
+
+    async def stream():
+        return [race async for meet_races in racing_aggregator.stream_races() for race in meet_races]
+
+    races = asyncio.run(stream())
+
+    assert len(races) == MEETS * RACES_PER_MEET
+    assert racing_aggregator.racing_api.list_calls == 0
@@ -0,0 +1,32 @@
+"""
+Atomic JSON writes
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.atomic_file import write_json_atomic
+
+
+def test_creates_directory_and_replaces(tmp_path):
+    path = str(tmp_path / "cache" / "state.json")
+    write_json_atomic(path, {"a": 1})
+    write_json_atomic(path, {"a": 2})
+
+    with open(path) as f:
+        assert json.load(f) == {"a": 2}
+    assert os.listdir(tmp_path / "cache") == ["state.json"]
+
+
+def test_failed_write_keeps_old_file(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_json_atomic(path, {"a": 1})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"a": object()})
+
+    with open(path) as f:
+        assert json.load(f) == {"a": 1}
+    assert os.listdir(tmp_path) == ["state.json"]
@@ -0,0 +1,35 @@
+"""
+Browser memory accounting
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils.browser_service import _driver_rss_mb
+
+SLEEPER = "import sys, time; time.sleep(30)"
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_only_the_playwright_driver_subtree_counts():
+    # Stand-ins for the driver and for a parse-pool worker holding ~200 MB
+    driver = subprocess.Popen([sys.executable, "-c", SLEEPER, "run-driver"])
+    worker = subprocess.Popen([sys.executable, "-c", "x = bytearray(200 * 1024 * 1024); " + SLEEPER])
+    try:
+        time.sleep(1)
+        measured = _driver_rss_mb(os.getpid())
+        assert measured == pytest.approx(rss_mb(driver.pid), abs=5)
+        assert measured < rss_mb(worker.pid)
+    finally:
+        for process in (driver, worker):
+            process.kill()
+            process.wait()
@@ -0,0 +1,67 @@
+"""
+Cassette record/replay through RacingAPIClient
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from utils.cassette import MANIFEST_FILE, Cassette
+from utils.racing_api import BASE_URL, RacingAPIClient
+
+ENDPOINT = "/australia/meets/m1/races"
+
+
+def races_payload(race_time: datetime) -> dict:
+    return {"races": [{
+        "race_number": 1,
+        "race_time": race_time.isoformat(),
+        "runners": [{"number": 1, "name": "Alpha"}],
+    }]}
+
+
+def test_replay_shifts_race_times_to_today(tmp_path):
+    # A day recorded three days ago, with the race an hour after recording
+    recorded_at = datetime.now(timezone.utc) - timedelta(days=3)
+    recorder = Cassette(str(tmp_path), "record")
+    recorder.record(ENDPOINT, None, httpx.Response(200, json=races_payload(recorded_at + timedelta(hours=1))))
+    with open(tmp_path / MANIFEST_FILE, "w") as f:
+        json.dump({"recorded_at": recorded_at.isoformat()}, f)
+
+    client = RacingAPIClient(cache_dir=None, cassette=Cassette(str(tmp_path), "replay"))
+    races = asyncio.run(client.get_races_for_meet("m1"))
+
+    expected = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert len(races) == 1
+    assert abs(races[0].start_time - expected) < timedelta(minutes=1)
+
+
+def test_recording_bypasses_fresh_cache_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv("RACINGAPI_USERNAME", "user")
+    monkeypatch.setenv("RACINGAPI_PASSWORD", "secret")
+    cache_dir = str(tmp_path / "cache")
+    fixtures = str(tmp_path / "fixtures")
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json=races_payload(datetime.now(timezone.utc) + timedelta(hours=1)))
+
+    async def fetch(client):
+        client._client = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+        races = await client.get_races_for_meet("m1")
+        await client.aclose()
+        return races
+
+    # Warm the cache without a cassette, then record: the fixture must still be written
+    asyncio.run(fetch(RacingAPIClient(cache_dir=cache_dir)))
+    recorder = Cassette(fixtures, "record")
+    races = asyncio.run(fetch(RacingAPIClient(cache_dir=cache_dir, cassette=recorder)))
+
+    assert len(races) == 1
+    assert len(requests) == 2
+    assert recorder.recorded == 1
+    assert len([name for name in os.listdir(fixtures) if name != MANIFEST_FILE]) == 1
@@ -0,0 +1,97 @@
+"""
+Tests for utils/html_parser.py: every backend must give the tip parsers the same input
+"""
+
+import pytest
+
+from utils import html_parser
+from scrapers.tips_scraper import parse_sky_racing
+from scrapers.sport_tips_scraper import parse_footyforecaster
+
+BACKENDS = html_parser.available_backends()
+
+FOOTYFORECASTER_PAGE = """
+<html><head>
+<style>h3::before { content: "Foo v Bar (Baz)"; }</style>
+<script>var fixture = "Foo v Bar (Baz)\\nFoo by 3 points";</script>
+</head><body>
+<noscript>Foo v Bar (Baz) Foo by 3 points</noscript>
+<div><h3>Carlton v Essendon (MCG)</h3><p>Probability</p>
+<p>Carlton 61.0% Essendon 39.0%</p><p>Forecast</p><p>Carlton by 12 points</p></div>
+<script type="application/json">{"line": "Geelong v Hawthorn (GMHBA)"}</script>
+<div><h3>Geelong v Hawthorn (GMHBA)</h3><p>Forecast</p><p>Hawthorn by 4 points</p></div>
+</body></html>
+"""
+
+SKY_PAGE = """
+<html><body>
+<div class="tip-card"><span class="venue-name">Randwick</span><span class="race-num">Race 3</span>
+<script>document.write("<li class='selection-item'>")</script>
+<ul><li class="selection-item"><span class="horse">Starlight Express<script>track('x')</script></span>
+<p class="analysis">Drawn well<style>.a{}</style>, should lead.</p></li></ul></div>
+</body></html>
+"""
+
+
+class AnyRace:
+    id = "race"
+
+
+class AnyRaceIndex:
+    def find_race(self, venue, race_number):
+        return AnyRace()
+
+    def find_runner_number(self, race, runner_name):
+        return 1
+
+
+@pytest.fixture
+def backend(request, monkeypatch):
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_script_style_noscript_text_is_dropped(backend):
+    text = html_parser.parse_html(FOOTYFORECASTER_PAGE).text(separator="\n")
+
+    assert "Foo" not in text
+    assert "content:" not in text
+    assert "Carlton by 12 points" in text
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_tail_text_after_script_is_kept(backend):
+    node = html_parser.parse_html("<p>before<script>x()</script>after</p>").select_one("p")
+
+    assert node.text() == "beforeafter"
+
+
+def _parse_all(parse, page):
+    results = {}
+    for name in BACKENDS:
+        html_parser.PARSER_BACKEND = name
+        results[name] = parse(page)
+    return results
+
+
+def test_backends_agree_on_footyforecaster(monkeypatch):
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", html_parser.PARSER_BACKEND)
+    results = _parse_all(lambda page: parse_footyforecaster(page, "afl"), FOOTYFORECASTER_PAGE)
+
+    assert results["bs4"] == [
+        {"home_team": "Carlton", "away_team": "Essendon", "tipped_team": "Carlton", "margin": 12.0},
+        {"home_team": "Geelong", "away_team": "Hawthorn", "tipped_team": "Hawthorn", "margin": 4.0},
+    ]
+    for name, forecasts in results.items():
+        assert forecasts == results["bs4"], name
+
+
+def test_backends_agree_on_sky_racing(monkeypatch):
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", html_parser.PARSER_BACKEND)
+    results = _parse_all(lambda page: parse_sky_racing(page, AnyRaceIndex(), "Sky Racing"), SKY_PAGE)
+
+    assert len(results["bs4"]) == 1
+    assert "track" not in results["bs4"][0]["runner_name"]
+    for name, tips in results.items():
+        assert tips == results["bs4"], name
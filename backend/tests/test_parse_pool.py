@@ -0,0 +1,41 @@
+"""
+Tests for utils/parse_pool.py: parsers run in forkserver/spawn workers
+"""
+
+import asyncio
+
+import pytest
+
+from utils import parse_pool
+from scrapers.tips_scraper import has_tips
+from scrapers.sport_tips_scraper import parse_footyforecaster
+
+PAGE = "<div class='tip'><h3>Carlton v Essendon (MCG)</h3><p>Carlton by 12 points</p></div>"
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(parse_pool, "PARSE_EXECUTOR", "process")
+    monkeypatch.setattr(parse_pool, "PARSE_WORKERS", 1)
+    parse_pool.shutdown_parse_executor()
+    yield
+    parse_pool.shutdown_parse_executor()
+
+
+def test_pool_does_not_fork(process_pool):
+    executor = parse_pool.get_parse_executor()
+
+    assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+def test_parsers_run_in_worker_processes(process_pool):
+    async def parse():
+        return (
+            await parse_pool.run_parser(has_tips, PAGE, ".tip"),
+            await parse_pool.run_parser(parse_footyforecaster, PAGE, "afl"),
+        )
+
+    found, forecasts = asyncio.run(parse())
+
+    assert found is True
+    assert forecasts == [{"home_team": "Carlton", "away_team": "Essendon", "tipped_team": "Carlton", "margin": 12.0}]
@@ -0,0 +1,74 @@
+"""
+Tests for utils/race_index.py
+"""
+
+from datetime import datetime, timezone
+
+from models.database import Race, Runner
+from utils.race_index import RaceIndex
+
+
+def make_race(*names: str) -> Race:
+    return Race(
+        id="meet-1",
+        meet_id="meet",
+        venue="Flemington",
+        race_number=1,
+        start_time=datetime(2026, 3, 1, 3, 0, tzinfo=timezone.utc),
+        runners=[Runner(number=number, name=name) for number, name in enumerate(names, start=1)],
+    )
+
+
+def test_exact_name_ignores_case_punctuation_and_country():
+    race = make_race("Ocean's Eleven (NZ)", "Starlight Express")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "OCEANS ELEVEN") == 1
+
+
+def test_misspelt_name_is_not_captured_by_short_runner_name():
+    race = make_race("Quick Silver", "Starlight Express", "Star")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "Starlite Express") == 2
+
+
+def test_partial_name_matches_whole_words():
+    race = make_race("Quick Silver", "Starlight Express", "Star")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "Express") == 2
+    assert index.find_runner_number(race, "Star") == 3
+
+
+def test_word_shared_by_several_runners_matches_none():
+    race = make_race("Starlight Express", "Midnight Express", "Quick Silver")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "Express") is None
+    assert index.find_runner_number(race, "Midnight") == 2
+
+
+def test_one_word_runner_does_not_capture_longer_name():
+    race = make_race("Bold", "Quick Silver")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "Bold Venture") is None
+    assert index.find_runner_number(race, "Quick Silver Lining") == 2
+
+
+def test_unrelated_name_has_no_match():
+    race = make_race("Quick Silver", "Starlight Express")
+    index = RaceIndex([race])
+
+    assert index.find_runner_number(race, "Thunder Road") is None
+    assert index.find_runner_number(race, "") is None
+
+
+def test_find_race_by_normalised_venue_and_fallback():
+    race = make_race("Quick Silver")
+    index = RaceIndex([race])
+
+    assert index.find_race("flemington", 1) is race
+    assert index.find_race("Flemington Racecourse", 1) is race
+    assert index.find_race("Randwick", 1) is None
@@ -0,0 +1,29 @@
+"""
+FootyForecaster round choice
+"""
+
+from datetime import datetime
+
+from scrapers.sport_tips_scraper import SportTipsScraper
+
+NOW = datetime(2026, 6, 10, 12)
+
+
+def link(index, text, context=""):
+    return {"index": index, "text": text, "context": context, "visible": True}
+
+
+def test_picks_round_in_progress():
+    links = [
+        link(0, "2026 Round 12", "2026 Round 12 30th May - 2nd Jun"),
+        link(1, "2026 Round 13", "2026 Round 13 6th Jun - 9th Jun"),
+        link(2, "2026 Round 14", "2026 Round 14 13th Jun - 16th Jun"),
+    ]
+    # Round 13 ended yesterday; the next unfinished round wins
+    assert SportTipsScraper._choose_round(links, NOW) == 2
+    assert SportTipsScraper._choose_round(links, datetime(2026, 6, 7)) == 1
+
+
+def test_no_dates_skips_instead_of_guessing():
+    links = [link(0, "2026 Opening Round"), link(1, "2026 Round 1"), link(2, "2026 Round 14")]
+    assert SportTipsScraper._choose_round(links, NOW) is None
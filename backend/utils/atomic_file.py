@@ -0,0 +1,32 @@
+"""
+Atomic JSON Files
+
+Cache and state files are shared by concurrent shards and read back by
+later runs, so they're written to a per-process temp file and renamed
+into place: readers see the old file or the new one, never half of one.
+"""
+
+import os
+import json
+from typing import Any, Callable, Optional
+
+
+def write_json_atomic(path: str, data: Any, default: Optional[Callable[[Any], Any]] = None, **dump_kwargs):
+    """
+    Write data as JSON to path atomically, creating its directory if needed
+
+    Raises OSError (or TypeError for unserializable data) like json.dump;
+    the temp file is removed on failure.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, default=default, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,246 @@
+"""
+Shared Warm Browser Service
+
+One long-lived Chromium per process, shared by TipsScraper and
+SportTipsScraper, so repeated scrapes (e.g. in --poll mode) skip the
+cold launch. Set BROWSER_ENDPOINT to a Playwright browser server
+(`playwright launch-server` / a browserless container) to share a single
+warm browser across worker processes instead.
+
+Scrapes get a fresh context per use, which is always closed afterwards.
+The browser is relaunched when it crashes or disconnects, after
+BROWSER_MAX_CONTEXTS contexts, or once the local browser processes grow
+beyond BROWSER_MAX_RSS_MB.
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from loguru import logger
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from playwright.async_api import Error as PlaywrightError
+
+# ws:// endpoint of a running Playwright browser server; empty launches locally
+BROWSER_ENDPOINT = os.getenv("BROWSER_ENDPOINT", "")
+
+# Recycle the browser after this many contexts or above this RSS (local browser only)
+BROWSER_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", 200))
+BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", 1024))
+
+LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+
+
+def _driver_rss_mb(pid: int) -> Optional[float]:
+    """
+    Combined RSS of the Playwright driver a process started and everything
+    under it (Chromium), in MB
+
+    Only the subtree of the child running Playwright's `run-driver` counts,
+    so the process's other children (the parse pool's forkserver and
+    workers) don't push the browser over BROWSER_MAX_RSS_MB. Returns None
+    where /proc isn't available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, list] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Fields after the parenthesised command name: state, ppid, ...
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [child for child in children.get(pid, []) if _is_playwright_driver(child)]
+    while stack:
+        child = stack.pop()
+        try:
+            with open(f"/proc/{child}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        stack.extend(children.get(child, []))
+
+    return round(total / (1024 * 1024), 1)
+
+
+def _is_playwright_driver(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"run-driver" in f.read().split(b"\0")
+    except OSError:
+        return False
+
+
+class BrowserService:
+    """
+    Lazily launched, self-healing Chromium shared by every scraper in the process
+    """
+
+    def __init__(
+        self,
+        endpoint: str = BROWSER_ENDPOINT,
+        max_contexts: int = BROWSER_MAX_CONTEXTS,
+        max_rss_mb: float = BROWSER_MAX_RSS_MB
+    ):
+        self.endpoint = endpoint
+        self.max_contexts = max_contexts
+        self.max_rss_mb = max_rss_mb
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._active = 0
+        self._contexts_since_launch = 0
+        self._recycle = False
+
+        # Stats
+        self.launches = 0
+        self.restarts = 0
+        self.contexts = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _ensure_browser(self) -> Browser:
+        """
+        Return a connected browser, (re)launching it if needed
+        """
+        async with self._get_lock():
+            if self._browser is not None and self._recycle and self._active == 0:
+                await self._close_browser()
+
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("Browser disconnected; relaunching")
+                self._browser = None
+                self.restarts += 1
+
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+
+                if self.endpoint:
+                    self._browser = await self._playwright.chromium.connect(self.endpoint)
+                    logger.info(f"Connected to browser server at {self.endpoint}")
+                else:
+                    self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                    logger.info("Launched shared browser")
+
+                self._contexts_since_launch = 0
+                self._recycle = False
+                self.launches += 1
+
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self, **options) -> AsyncIterator[BrowserContext]:
+        """
+        Open a fresh browser context on the shared browser
+
+        Retries once on a new browser if the current one has crashed.
+        """
+        browser = None
+        try:
+            browser = await self._ensure_browser()
+            context = await browser.new_context(**options)
+        except PlaywrightError as e:
+            logger.warning(f"Could not open browser context ({e}); restarting browser")
+            await self._discard_browser(browser)
+            browser = await self._ensure_browser()
+            context = await browser.new_context(**options)
+
+        self._active += 1
+        self._contexts_since_launch += 1
+        self.contexts += 1
+
+        try:
+            yield context
+        finally:
+            self._active -= 1
+            try:
+                await context.close()
+            except PlaywrightError:
+                pass  # Browser already gone; relaunched on next use
+            self._check_recycle()
+
+    def _check_recycle(self):
+        """
+        Mark the browser for a restart once it's been used or grown too much
+        """
+        if self._recycle or self._browser is None:
+            return
+
+        if self._contexts_since_launch >= self.max_contexts:
+            logger.info(f"Recycling browser after {self._contexts_since_launch} contexts")
+            self._recycle = True
+            return
+
+        if not self.endpoint and self._active == 0:
+            rss = _driver_rss_mb(os.getpid())
+            if rss is not None and rss > self.max_rss_mb:
+                logger.info(f"Recycling browser at {rss:.0f} MB RSS")
+                self._recycle = True
+
+    async def _discard_browser(self, failed: Optional[Browser]):
+        """
+        Close a browser that failed to open a context
+
+        Concurrent callers can fail on the same crashed browser. Only the
+        first one closes it; the others find it already replaced and reuse
+        the new one.
+        """
+        async with self._get_lock():
+            if failed is not None and self._browser is failed:
+                await self._close_browser()
+                self.restarts += 1
+
+    async def _close_browser(self):
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError:
+                pass
+            self._browser = None
+
+    async def close(self):
+        """
+        Close the browser and Playwright (a later context() starts them again)
+        """
+        await self._close_browser()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._lock = None
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "launches": self.launches,
+            "restarts": self.restarts,
+            "contexts": self.contexts,
+            "active": self._active,
+        }
+
+
+_browser_service: Optional[BrowserService] = None
+
+
+def get_browser_service() -> BrowserService:
+    """
+    Process-wide browser service shared by all scrapers
+    """
+    global _browser_service
+    if _browser_service is None:
+        _browser_service = BrowserService()
+    return _browser_service
@@ -0,0 +1,164 @@
+"""
+Record/Replay Cassette for HTTP Clients
+
+In record mode every response is written to a fixture directory. In
+replay mode those fixtures are served back with synthetic latency and no
+network access, so a race day's API traffic can be re-run for profiling
+and regression tests of the odds and consensus stages.
+
+Only the client that owns the cassette is replayed. The aggregator wires
+one into RacingAPIClient; tip scraping, Claude and Supabase still go to
+the network during a replayed run.
+
+A cassette directory holds one race day, so the `date` query parameter
+is ignored when keying fixtures; a day recorded on Saturday replays on
+any later date. Recording writes the time it started to cassette.json,
+and a replaying client moves recorded race times forward by the time
+since (see time_shift), so every race is as far from its jump as it was
+when recorded instead of long started.
+"""
+
+import os
+import json
+import random
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import httpx
+from loguru import logger
+
+from utils.atomic_file import write_json_atomic
+
+MODES = ("off", "record", "replay")
+
+# Query parameters that vary by run day and are ignored in fixture keys
+VOLATILE_PARAMS = {"date"}
+
+# Response headers worth keeping in fixtures
+KEPT_HEADERS = ("content-type", "etag", "last-modified", "retry-after")
+
+# Per-directory manifest holding the time recording started
+MANIFEST_FILE = "cassette.json"
+
+
+class Cassette:
+    """
+    Fixture store keyed by endpoint + params
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "replay",
+        latency: float = 0.0,
+        jitter: float = 0.0
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {MODES}, got '{mode}'")
+
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+
+        # Stats
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+
+        self.recorded_at: Optional[datetime] = None
+        manifest = os.path.join(directory, MANIFEST_FILE)
+        if mode == "record":
+            self.recorded_at = datetime.now(timezone.utc)
+            write_json_atomic(manifest, {"recorded_at": self.recorded_at.isoformat()})
+        elif mode == "replay":
+            if not os.path.isdir(directory):
+                raise ValueError(f"Cassette directory not found: {directory}")
+            try:
+                with open(manifest) as f:
+                    self.recorded_at = datetime.fromisoformat(json.load(f)["recorded_at"])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"No recording time in {manifest} ({e}); race times will not be shifted")
+
+        logger.info(f"Cassette in {mode} mode ({directory})")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def time_shift(self) -> timedelta:
+        """
+        How far to move recorded timestamps forward when replaying: the time
+        elapsed since recording started (zero when not replaying)
+        """
+        if not self.replaying or self.recorded_at is None:
+            return timedelta(0)
+        return datetime.now(timezone.utc) - self.recorded_at
+
+    def _path(self, endpoint: str, params: Optional[Dict]) -> str:
+        stable = {k: v for k, v in (params or {}).items() if k not in VOLATILE_PARAMS}
+        raw = json.dumps([endpoint, stable], sort_keys=True)
+        digest = hashlib.sha256(raw.encode()).hexdigest()[:16]
+        slug = endpoint.strip("/").replace("/", "_") or "root"
+        return os.path.join(self.directory, f"{slug}-{digest}.json")
+
+    def record(self, endpoint: str, params: Optional[Dict], response: httpx.Response):
+        """
+        Write a response to the fixture directory
+        """
+        fixture = {
+            "endpoint": endpoint,
+            "params": params or {},
+            "status_code": response.status_code,
+            "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+            "body": response.text,
+        }
+
+        write_json_atomic(self._path(endpoint, params), fixture, indent=2)
+        self.recorded += 1
+
+    async def replay(self, endpoint: str, params: Optional[Dict], url: str) -> httpx.Response:
+        """
+        Serve a recorded response after a synthetic delay
+
+        Missing fixtures are returned as 404 so callers handle them like
+        any other API error.
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        request = httpx.Request("GET", url, params=params)
+        path = self._path(endpoint, params)
+
+        if not os.path.exists(path):
+            self.missing += 1
+            logger.warning(f"No cassette fixture for {endpoint} {params or ''}")
+            return httpx.Response(404, text="No cassette fixture", request=request)
+
+        with open(path) as f:
+            fixture = json.load(f)
+
+        self.replayed += 1
+        return httpx.Response(
+            fixture["status_code"],
+            headers=fixture.get("headers", {}),
+            text=fixture.get("body", ""),
+            request=request
+        )
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "missing": self.missing,
+        }
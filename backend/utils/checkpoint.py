@@ -0,0 +1,111 @@
+"""
+Run Checkpoint Store
+
+Persists each pipeline stage's per-item outputs to a local SQLite file,
+keyed by run date, stage, item key and a fingerprint of the item's
+inputs. A resumed run reuses every output whose inputs still match, so a
+crash mid-run doesn't re-spend API quota or Claude tokens on finished work.
+"""
+
+import os
+import json
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+from utils.fingerprints import FingerprintStore
+from utils.response_cache import json_default
+
+# Checkpoints from runs older than this many days are pruned on open
+RETENTION_DAYS = 2
+
+
+class CheckpointStore:
+    """
+    SQLite-backed checkpoint table for one run date
+    """
+
+    def __init__(self, path: str, run_date: Optional[str] = None):
+        self.path = path
+        self.run_date = run_date or date.today().isoformat()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                run_date TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                input_fingerprint TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (run_date, stage, key)
+            )
+            """
+        )
+        cutoff = (date.fromisoformat(self.run_date) - timedelta(days=RETENTION_DAYS)).isoformat()
+        self._conn.execute("DELETE FROM checkpoints WHERE run_date < ?", (cutoff,))
+        self._conn.commit()
+
+        # Stats
+        self.hits = 0
+        self.writes = 0
+
+    def clear(self):
+        """
+        Drop this run date's checkpoints (fresh, non-resumed run)
+        """
+        self._conn.execute("DELETE FROM checkpoints WHERE run_date = ?", (self.run_date,))
+        self._conn.commit()
+
+    def get(self, stage: str, key: str, inputs: Any = None) -> Tuple[bool, Any]:
+        """
+        Look up a stage output
+
+        Returns:
+            (found, payload); found is False when missing or the inputs changed
+        """
+        row = self._conn.execute(
+            "SELECT input_fingerprint, payload FROM checkpoints "
+            "WHERE run_date = ? AND stage = ? AND key = ?",
+            (self.run_date, stage, key)
+        ).fetchone()
+
+        if not row or row[0] != FingerprintStore.fingerprint(inputs):
+            return False, None
+
+        self.hits += 1
+        return True, json.loads(row[1])
+
+    def put(self, stage: str, key: str, inputs: Any, payload: Any):
+        """
+        Record a stage output once its side effects are complete
+        """
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_date,
+                    stage,
+                    key,
+                    FingerprintStore.fingerprint(inputs),
+                    json.dumps(payload, default=json_default),
+                    time.time(),
+                )
+            )
+            self._conn.commit()
+            self.writes += 1
+        except (sqlite3.Error, TypeError) as e:
+            logger.warning(f"Could not write checkpoint {stage}/{key}: {e}")
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {"run_date": self.run_date, "hits": self.hits, "writes": self.writes}
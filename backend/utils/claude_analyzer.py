@@ -8,6 +8,7 @@ Uses Anthropic's Claude API to:
 """
 
 import os
+import asyncio
 from typing import Dict, List
 from anthropic import Anthropic
 from loguru import logger
@@ -67,7 +68,9 @@ Respond in JSON format:
     "summary": "<brief explanation>"
 }}"""
 
-            message = self.client.messages.create(
+            # The Anthropic client is synchronous; keep it off the event loop
+            message = await asyncio.to_thread(
+                self.client.messages.create,
                 model=self.model,
                 max_tokens=500,
                 temperature=0.3,
@@ -149,7 +152,8 @@ Examples:
 
 Your verdict:"""
 
-            message = self.client.messages.create(
+            message = await asyncio.to_thread(
+                self.client.messages.create,
                 model=self.model,
                 max_tokens=100,
                 temperature=0.5,
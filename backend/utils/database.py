@@ -5,6 +5,7 @@ Handles all database operations for the racing aggregator
 """
 
 import os
+import asyncio
 from typing import List, Dict, Optional
 from supabase import create_client, Client
 from loguru import logger
@@ -27,6 +28,15 @@ class SupabaseClient:
         self.client: Client = create_client(url, key)
         logger.info("Supabase client initialized")
 
+    async def _execute(self, query):
+        """
+        Execute a query builder off the event loop
+
+        supabase-py is synchronous; running execute() in a worker thread
+        lets database writes overlap with in-flight API requests.
+        """
+        return await asyncio.to_thread(query.execute)
+
     async def upsert_meet(self, meet: Meet):
         """
         Insert or update a race meet
@@ -36,7 +46,7 @@ class SupabaseClient:
             # Convert date to string for JSON serialization
             if 'date' in data and hasattr(data['date'], 'isoformat'):
                 data['date'] = data['date'].isoformat()
-            result = self.client.table("meets").upsert(data).execute()
+            result = await self._execute(self.client.table("meets").upsert(data))
             logger.debug(f"Upserted meet: {meet.id}")
             return result
 
@@ -65,7 +75,7 @@ class SupabaseClient:
                     if hasattr(value, 'isoformat'):
                         runner[key] = value.isoformat()
 
-            result = self.client.table("races").upsert(data).execute()
+            result = await self._execute(self.client.table("races").upsert(data))
             logger.debug(f"Upserted race: {race.id}")
             return result
 
@@ -79,7 +89,7 @@ class SupabaseClient:
         """
         try:
             data = odds.dict(exclude={'id'})
-            result = self.client.table("race_odds").insert(data).execute()
+            result = await self._execute(self.client.table("race_odds").insert(data))
             return result
 
         except Exception as e:
@@ -92,13 +102,13 @@ class SupabaseClient:
         Get the best odds for a runner
         """
         try:
-            result = self.client.table("race_odds") \
+            query = self.client.table("race_odds") \
                 .select("bookmaker, odds") \
                 .eq("race_id", race_id) \
                 .eq("runner_number", runner_number) \
                 .order("odds", desc=True) \
-                .limit(1) \
-                .execute()
+                .limit(1)
+            result = await self._execute(query)
 
             if result.data:
                 return {
@@ -121,7 +131,7 @@ class SupabaseClient:
             # Convert datetime to ISO string
             if 'scraped_at' in data and hasattr(data['scraped_at'], 'isoformat'):
                 data['scraped_at'] = data['scraped_at'].isoformat()
-            result = self.client.table("expert_tips").upsert(data).execute()
+            result = await self._execute(self.client.table("expert_tips").upsert(data))
             logger.debug(f"Saved tip: {tip.source} - {tip.runner_name}")
             return result
 
@@ -134,11 +144,11 @@ class SupabaseClient:
         Get all tips for a specific runner
         """
         try:
-            result = self.client.table("expert_tips") \
+            query = self.client.table("expert_tips") \
                 .select("*") \
                 .eq("race_id", race_id) \
-                .eq("runner_number", runner_number) \
-                .execute()
+                .eq("runner_number", runner_number)
+            result = await self._execute(query)
 
             return result.data
 
@@ -155,7 +165,7 @@ class SupabaseClient:
             # Convert datetime to ISO string
             if 'updated_at' in data and hasattr(data['updated_at'], 'isoformat'):
                 data['updated_at'] = data['updated_at'].isoformat()
-            result = self.client.table("consensus_scores").upsert(data).execute()
+            result = await self._execute(self.client.table("consensus_scores").upsert(data))
             logger.debug(f"Saved consensus: {consensus.runner_name} - Score: {consensus.consensus_score}")
             return result
 
@@ -173,11 +183,11 @@ class SupabaseClient:
         Update the AI verdict for a consensus score
         """
         try:
-            result = self.client.table("consensus_scores") \
+            query = self.client.table("consensus_scores") \
                 .update({"ai_verdict": verdict}) \
                 .eq("race_id", race_id) \
-                .eq("runner_number", runner_number) \
-                .execute()
+                .eq("runner_number", runner_number)
+            result = await self._execute(query)
 
             return result
 
@@ -192,7 +202,7 @@ class SupabaseClient:
         Uses the database function created in schema.sql
         """
         try:
-            result = self.client.rpc("get_todays_races_with_consensus").execute()
+            result = await self._execute(self.client.rpc("get_todays_races_with_consensus"))
             return result.data
 
         except Exception as e:
@@ -219,7 +229,7 @@ class SupabaseClient:
                 "user_agent": user_agent
             }
 
-            result = self.client.table("affiliate_clicks").insert(data).execute()
+            result = await self._execute(self.client.table("affiliate_clicks").insert(data))
             return result
 
         except Exception as e:
@@ -235,7 +245,7 @@ class SupabaseClient:
         """Upsert a sport match with aggregated odds and predictions"""
         try:
             data = match.dict()
-            result = self.client.table("sport_matches").upsert(data).execute()
+            result = await self._execute(self.client.table("sport_matches").upsert(data))
             logger.debug(f"Upserted sport match: {match.home_team} vs {match.away_team}")
             return result
         except Exception as e:
@@ -246,9 +256,9 @@ class SupabaseClient:
         """Save an expert tip for a sport match"""
         try:
             data = tip.dict()
-            result = self.client.table("sport_expert_tips").upsert(
+            result = await self._execute(self.client.table("sport_expert_tips").upsert(
                 data, on_conflict="match_id,source,expert_name"
-            ).execute()
+            ))
             logger.debug(f"Saved sport tip: {tip.source} - {tip.tipped_team}")
             return result
         except Exception as e:
@@ -259,9 +269,9 @@ class SupabaseClient:
         """Upsert tip consensus for a sport match"""
         try:
             data = consensus.dict()
-            result = self.client.table("sport_tip_consensus").upsert(
+            result = await self._execute(self.client.table("sport_tip_consensus").upsert(
                 data, on_conflict="match_id"
-            ).execute()
+            ))
             logger.debug(f"Upserted consensus for match: {consensus.match_id}")
             return result
         except Exception as e:
@@ -279,7 +289,7 @@ class SupabaseClient:
                 now = datetime.now(timezone.utc).isoformat()
                 query = query.gte("commence_time", now)
             query = query.order("commence_time")
-            result = query.execute()
+            result = await self._execute(query)
             return result.data
         except Exception as e:
             logger.error(f"Error getting sport matches: {e}")
@@ -289,11 +299,11 @@ class SupabaseClient:
         """Get a sport match with its expert tips and consensus"""
         try:
             # Get the match
-            match_result = self.client.table("sport_matches") \
+            match_query = self.client.table("sport_matches") \
                 .select("*") \
                 .eq("id", match_id) \
-                .single() \
-                .execute()
+                .single()
+            match_result = await self._execute(match_query)
 
             if not match_result.data:
                 return None
@@ -301,18 +311,18 @@ class SupabaseClient:
             match_data = match_result.data
 
             # Get expert tips
-            tips_result = self.client.table("sport_expert_tips") \
+            tips_query = self.client.table("sport_expert_tips") \
                 .select("*") \
-                .eq("match_id", match_id) \
-                .execute()
+                .eq("match_id", match_id)
+            tips_result = await self._execute(tips_query)
             match_data["expert_tips"] = tips_result.data or []
 
             # Get consensus
-            consensus_result = self.client.table("sport_tip_consensus") \
+            consensus_query = self.client.table("sport_tip_consensus") \
                 .select("*") \
                 .eq("match_id", match_id) \
-                .single() \
-                .execute()
+                .single()
+            consensus_result = await self._execute(consensus_query)
             match_data["tip_consensus"] = consensus_result.data
 
             return match_data
@@ -0,0 +1,121 @@
+"""
+Content Fingerprint Store
+
+Remembers a hash of each race's runners + odds payload between runs so
+the worker can skip races whose data hasn't moved since they were last
+saved.
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+
+from utils.atomic_file import write_json_atomic
+
+# Fingerprints older than this are dropped on load
+RETENTION_SECONDS = 3 * 24 * 3600
+
+
+class FingerprintStore:
+    """
+    Persistent {key: fingerprint} map, optionally backed by a JSON file
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._pending: Dict[str, str] = {}
+
+        # Stats
+        self.unchanged = 0
+        self.changed = 0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        """
+        Stable hash of a JSON-serializable payload
+        """
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fingerprint store {self.path}: {e}")
+            return
+
+        cutoff = time.time() - RETENTION_SECONDS
+        self._entries = {
+            key: entry for key, entry in entries.items()
+            if entry.get("updated_at", 0) >= cutoff
+        }
+
+    def is_unchanged(self, key: str, fingerprint: str) -> bool:
+        """
+        Check a fingerprint against the last committed one
+
+        A changed fingerprint is held as pending until commit() is called,
+        so a failed save is retried on the next run.
+        """
+        entry = self._entries.get(key)
+        if entry and entry["fingerprint"] == fingerprint:
+            self.unchanged += 1
+            return True
+
+        self.changed += 1
+        self._pending[key] = fingerprint
+        return False
+
+    def current(self, key: str) -> Optional[str]:
+        """
+        Latest fingerprint seen for a key: pending if there is one, else committed
+        """
+        if key in self._pending:
+            return self._pending[key]
+        entry = self._entries.get(key)
+        return entry["fingerprint"] if entry else None
+
+    def commit(self, key: str):
+        """
+        Accept the pending fingerprint for a key once its data is saved
+        """
+        fingerprint = self._pending.pop(key, None)
+        if fingerprint:
+            self._entries[key] = {"fingerprint": fingerprint, "updated_at": time.time()}
+
+    def drop(self, predicate: Callable[[str], bool]) -> int:
+        """
+        Forget committed and pending fingerprints whose key matches predicate
+
+        Returns the number of committed entries dropped.
+        """
+        self._pending = {key: fp for key, fp in self._pending.items() if not predicate(key)}
+        before = len(self._entries)
+        self._entries = {key: entry for key, entry in self._entries.items() if not predicate(key)}
+        return before - len(self._entries)
+
+    def save(self):
+        """
+        Persist committed fingerprints
+        """
+        if not self.path:
+            return
+
+        try:
+            write_json_atomic(self.path, self._entries)
+        except OSError as e:
+            logger.warning(f"Could not save fingerprint store {self.path}: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {"changed": self.changed, "unchanged": self.unchanged}
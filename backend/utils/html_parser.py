@@ -0,0 +1,159 @@
+"""
+Pluggable HTML Parser Backends
+
+Tip parsers work against a small node interface (select / select_one /
+text) so the engine underneath can be swapped:
+
+    selectolax  Lexbor engine, fastest (optional dependency)
+    lxml        lxml.html with precompiled CSSSelector objects (needs cssselect)
+    bs4         BeautifulSoup on lxml, always available fallback
+
+PARSER_BACKEND=auto (default) picks the fastest one installed. Compare
+them on saved pages with scripts/benchmark_parsers.py.
+
+Every backend drops NON_CONTENT_TAGS (script, style, noscript) when
+parsing, so text() and selectors see the same content whichever is used.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    LXML_CSS_AVAILABLE = True
+except ImportError:
+    LXML_CSS_AVAILABLE = False
+
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "auto")
+
+# Elements whose contents are never page text
+NON_CONTENT_TAGS = ("script", "style", "noscript")
+
+
+class Node(ABC):
+    """Element interface shared by every backend"""
+
+    @abstractmethod
+    def select(self, selector: str) -> List["Node"]:
+        ...
+
+    @abstractmethod
+    def select_one(self, selector: str) -> Optional["Node"]:
+        ...
+
+    @abstractmethod
+    def text(self, separator: str = "") -> str:
+        ...
+
+
+class SoupNode(Node):
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def select(self, selector: str) -> List[Node]:
+        return [SoupNode(tag) for tag in self._tag.select(selector)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        tag = self._tag.select_one(selector)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self, separator: str = "") -> str:
+        return self._tag.get_text(separator=separator)
+
+
+@lru_cache(maxsize=256)
+def _compiled_selector(selector: str):
+    """CSS selector compiled to XPath once per process"""
+    return CSSSelector(selector)
+
+
+class LxmlNode(Node):
+    __slots__ = ("_element",)
+
+    def __init__(self, element):
+        self._element = element
+
+    def select(self, selector: str) -> List[Node]:
+        return [LxmlNode(element) for element in _compiled_selector(selector)(self._element)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        matches = _compiled_selector(selector)(self._element)
+        return LxmlNode(matches[0]) if matches else None
+
+    def text(self, separator: str = "") -> str:
+        return separator.join(self._element.itertext())
+
+
+class SelectolaxNode(Node):
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector: str) -> List[Node]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def text(self, separator: str = "") -> str:
+        return self._node.text(separator=separator)
+
+
+def available_backends() -> List[str]:
+    """
+    Installed backends, fastest first
+    """
+    backends = []
+    if SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    if LXML_CSS_AVAILABLE:
+        backends.append("lxml")
+    backends.append("bs4")
+    return backends
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Backend to use: the requested one if installed, else the fastest available
+    """
+    backend = backend or PARSER_BACKEND
+    available = available_backends()
+    return backend if backend in available else available[0]
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> Node:
+    """
+    Parse a document and return its root node
+    """
+    backend = resolve_backend(backend)
+
+    if backend == "selectolax":
+        tree = SelectolaxParser(html or "<html></html>")
+        tree.strip_tags(list(NON_CONTENT_TAGS))
+        return SelectolaxNode(tree.root)
+
+    if backend == "lxml":
+        document = lxml.html.document_fromstring(html or "<html></html>")
+        for element in list(document.iter(*NON_CONTENT_TAGS)):
+            element.drop_tree()  # Keeps the element's tail text
+        return LxmlNode(document)
+
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup(list(NON_CONTENT_TAGS)):
+        tag.decompose()
+    return SoupNode(soup)
@@ -0,0 +1,170 @@
+"""
+Imminence-Prioritised Odds Refresh Queue
+
+Orders races for odds refreshes by start time so the soonest jumps are
+refreshed first when we're rate-limited. Races that have started drop
+out, and a race is only due once its odds are older than the maximum
+staleness allowed for its time-to-jump bucket.
+"""
+
+import os
+import heapq
+import itertools
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from models.database import Race
+
+# (max minutes to jump, max staleness in seconds); None = any later race
+DEFAULT_STALENESS_BUCKETS: List[Tuple[Optional[float], float]] = [
+    (10, 60),
+    (30, 300),
+    (120, 900),
+    (None, 1800),
+]
+
+
+def parse_staleness_buckets(value: Optional[str]) -> List[Tuple[Optional[float], float]]:
+    """
+    Parse "10:60,30:300,120:900,*:1800" (minutes-to-jump:max-staleness-seconds)
+    """
+    if not value:
+        return list(DEFAULT_STALENESS_BUCKETS)
+
+    buckets = []
+    for part in value.split(","):
+        minutes, staleness = part.strip().split(":")
+        limit = None if minutes.strip() in ("*", "") else float(minutes)
+        buckets.append((limit, float(staleness)))
+
+    # Bounded buckets in ascending order, open-ended bucket last
+    buckets.sort(key=lambda b: float("inf") if b[0] is None else b[0])
+    if buckets[-1][0] is not None:
+        buckets.append((None, buckets[-1][1]))
+    return buckets
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from the API as UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class OddsRefreshQueue:
+    """
+    Min-heap of races keyed by start time, filtered by staleness
+
+    Keeps the last refresh time per race in memory, so repeated calls
+    within a long-running worker only return races whose odds are stale.
+    """
+
+    def __init__(self, buckets: Optional[List[Tuple[Optional[float], float]]] = None):
+        self.buckets = buckets or parse_staleness_buckets(os.getenv("ODDS_STALENESS_BUCKETS"))
+        self.last_refreshed: Dict[str, datetime] = {}
+        self._heap: List[Tuple[datetime, int, Race]] = []
+        self._counter = itertools.count()
+
+        # Stats
+        self.dropped_started = 0
+        self.skipped_fresh = 0
+
+    def max_staleness(self, seconds_to_jump: float) -> float:
+        """
+        Maximum odds age (seconds) for a race this far from the jump
+        """
+        minutes = seconds_to_jump / 60
+        for limit, staleness in self.buckets:
+            if limit is None or minutes <= limit:
+                return staleness
+        return self.buckets[-1][1]
+
+    def is_due(self, race: Race, now: Optional[datetime] = None) -> bool:
+        """
+        Whether a race's odds are older than its bucket allows
+        """
+        now = now or datetime.now(timezone.utc)
+        last = self.last_refreshed.get(race.id)
+        if last is None:
+            return True
+
+        seconds_to_jump = (_as_utc(race.start_time) - now).total_seconds()
+        return (now - last).total_seconds() >= self.max_staleness(seconds_to_jump)
+
+    def seconds_until_due(self, races: List[Race], now: Optional[datetime] = None) -> Optional[float]:
+        """
+        Seconds until the next upcoming race's odds go stale
+
+        Returns 0 if a race is already due, or None when no race is upcoming.
+        """
+        now = now or datetime.now(timezone.utc)
+        soonest = None
+
+        for race in races:
+            start_time = _as_utc(race.start_time)
+            if start_time <= now:
+                continue
+
+            last = self.last_refreshed.get(race.id)
+            if last is None:
+                return 0.0
+
+            staleness = self.max_staleness((start_time - now).total_seconds())
+            due_in = staleness - (now - last).total_seconds()
+            soonest = due_in if soonest is None else min(soonest, due_in)
+
+        return None if soonest is None else max(0.0, soonest)
+
+    def push(self, races: List[Race], now: Optional[datetime] = None):
+        """
+        Queue races that haven't started and whose odds are stale
+        """
+        now = now or datetime.now(timezone.utc)
+        for race in races:
+            start_time = _as_utc(race.start_time)
+            if start_time <= now:
+                self.dropped_started += 1
+                continue
+            if not self.is_due(race, now):
+                self.skipped_fresh += 1
+                continue
+            heapq.heappush(self._heap, (start_time, next(self._counter), race))
+
+    def pop(self) -> Optional[Race]:
+        """
+        Next soonest race still before its jump, or None when empty
+        """
+        now = datetime.now(timezone.utc)
+        while self._heap:
+            start_time, _, race = heapq.heappop(self._heap)
+            if start_time > now:
+                return race
+            self.dropped_started += 1
+        return None
+
+    def mark_refreshed(self, race_id: str, when: Optional[datetime] = None):
+        self.last_refreshed[race_id] = when or datetime.now(timezone.utc)
+
+    def prune(self, races: List[Race], now: Optional[datetime] = None) -> Set[str]:
+        """
+        Forget refresh times of races that have jumped
+
+        Returns the ids of the jumped races, so callers can drop their own
+        per-race state too.
+        """
+        now = now or datetime.now(timezone.utc)
+        jumped = {race.id for race in races if _as_utc(race.start_time) <= now}
+        for race_id in jumped:
+            self.last_refreshed.pop(race_id, None)
+        return jumped
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "queued": len(self._heap),
+            "dropped_started": self.dropped_started,
+            "skipped_fresh": self.skipped_fresh,
+        }
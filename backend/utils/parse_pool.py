@@ -0,0 +1,75 @@
+"""
+Off-Loop HTML Parsing
+
+BeautifulSoup/lxml parsing is CPU-bound and would stall every in-flight
+request if run on the event loop. Scrapers hand parsers (module-level
+functions taking HTML and returning plain dicts) to run_parser(), which
+runs them on a shared executor:
+
+    process  ProcessPoolExecutor, true parallelism (default). Workers are
+             started with forkserver (spawn where unavailable), never
+             fork: the pool is created after worker threads, loguru's
+             handler locks and the Playwright driver exist, and forking a
+             multithreaded process can deadlock the child
+    thread   ThreadPoolExecutor, cheaper start-up; lxml releases the GIL
+             for part of the work
+    inline   run on the loop (debugging)
+"""
+
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from loguru import logger
+
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "process")
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_executor: Optional[Executor] = None
+
+
+def get_parse_executor() -> Optional[Executor]:
+    """
+    Shared parsing executor, created on first use (None when inline)
+    """
+    global _executor
+    if _executor is None and PARSE_EXECUTOR != "inline":
+        if PARSE_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        else:
+            _executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context(START_METHOD)
+            )
+        logger.info(f"Parsing on {PARSE_WORKERS} {PARSE_EXECUTOR} workers")
+    return _executor
+
+
+async def run_parser(parser: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a parser off the event loop and return its result
+
+    With the process executor, the parser must be importable by name (a
+    module-level function), its arguments picklable, and the result should
+    be plain data.
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return parser(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(parser, *args, **kwargs))
+
+
+def shutdown_parse_executor():
+    """
+    Stop the parsing workers (a later run_parser() starts new ones)
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,60 @@
+"""
+Per-Domain Politeness Throttle
+
+Spaces out requests to the same host by a minimum delay while letting
+requests to different hosts run concurrently, so adding a tip source on a
+new site doesn't slow down the others.
+"""
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class DomainThrottle:
+    """
+    Minimum delay between request starts, tracked per domain
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+
+        # Stats
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    @staticmethod
+    def domain(url: str) -> str:
+        host = urlparse(url).hostname or url
+        return host[4:] if host.startswith("www.") else host
+
+    async def wait(self, url: str):
+        """
+        Wait until a request to this URL's domain is allowed to start
+        """
+        domain = self.domain(url)
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+
+        # Hold the domain's lock while waiting so its requests queue up in order
+        async with lock:
+            last = self._last_request.get(domain)
+            if last is not None:
+                delay = self.delay - (time.monotonic() - last)
+                if delay > 0:
+                    self.waits += 1
+                    self.wait_seconds += delay
+                    await asyncio.sleep(delay)
+            self._last_request[domain] = time.monotonic()
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "domains": len(self._last_request),
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
@@ -0,0 +1,119 @@
+"""
+Race / Runner Lookup Index
+
+Built once per scrape from the day's races so every tip parser can match
+scraped venue + race number and runner names with dict lookups instead of
+scanning every race and runner per tip.
+
+Names are normalised (case, punctuation, country suffixes such as "(NZ)")
+before lookup. Runner names fall back to whole-word containment ("Express"
+-> "Starlight Express"), then to a fuzzy match; the closest candidate wins,
+and a short runner name never captures a longer misspelt one ("Star" does
+not match "Starlite Express").
+"""
+
+import re
+import difflib
+from typing import Dict, List, Optional, Tuple
+
+from models.database import Race
+
+# Minimum similarity for a fuzzy runner-name match
+FUZZY_CUTOFF = 0.82
+
+_COUNTRY_SUFFIX = re.compile(r"\((?:aus|nz|ire|gb|usa|fr|ger|jpn|saf|arg|brz|chi|can|ity)\)")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase, drop apostrophes, country suffixes and punctuation, collapse whitespace
+    """
+    name = _COUNTRY_SUFFIX.sub(" ", name.lower().replace("'", "").replace("’", ""))
+    return _NON_ALNUM.sub(" ", name).strip()
+
+
+class RaceIndex:
+    """
+    Lookup of races by (venue, race number) and runners by name
+    """
+
+    def __init__(self, races: List[Race]):
+        self.races = races
+        self._by_venue: Dict[Tuple[str, int], Race] = {}
+        self._by_number: Dict[int, List[Tuple[str, Race]]] = {}
+        self._runners: Dict[str, Dict[str, int]] = {}
+        self._fallbacks: Dict[Tuple[str, int], Optional[Race]] = {}
+
+        for race in races:
+            venue = normalize_name(race.venue)
+            self._by_venue.setdefault((venue, race.race_number), race)
+            self._by_number.setdefault(race.race_number, []).append((venue, race))
+            self._runners[race.id] = {
+                normalize_name(runner.name): runner.number for runner in race.runners
+            }
+
+    def find_race(self, venue: str, race_number: int) -> Optional[Race]:
+        """
+        Find a race by venue and race number
+
+        Falls back to races at that number whose venue contains the scraped
+        venue (or vice versa), e.g. "Flemington" vs "Flemington Racecourse".
+        """
+        key = (normalize_name(venue), race_number)
+
+        race = self._by_venue.get(key)
+        if race is not None:
+            return race
+
+        if key not in self._fallbacks:
+            venue_normalized = key[0]
+            self._fallbacks[key] = next(
+                (
+                    candidate
+                    for candidate_venue, candidate in self._by_number.get(race_number, [])
+                    if venue_normalized and (
+                        venue_normalized in candidate_venue or candidate_venue in venue_normalized
+                    )
+                ),
+                None
+            )
+
+        return self._fallbacks[key]
+
+    def find_runner_number(self, race: Race, runner_name: str) -> Optional[int]:
+        """
+        Find a runner's number by name: exact, then the one runner whose name
+        shares all of its words with it, then the closest similar name above
+        FUZZY_CUTOFF
+
+        A word match counts when every scraped word is in the runner's name
+        ("Express" for "Starlight Express"), or when every word of a
+        multi-word runner name is in the scraped name. A one-word runner
+        ("Bold") never captures a longer scraped name ("Bold Venture"), and
+        a word shared by several runners matches none of them.
+        """
+        runners = self._runners.get(race.id, {})
+        name = normalize_name(runner_name)
+        if not name:
+            return None
+
+        number = runners.get(name)
+        if number is not None:
+            return number
+
+        words = set(name.split())
+        containing = []
+        for candidate in runners:
+            candidate_words = set(candidate.split())
+            if not candidate_words:
+                continue
+            if words <= candidate_words or (len(candidate_words) > 1 and candidate_words <= words):
+                containing.append(candidate)
+        if len(containing) > 1:
+            return None  # Ambiguous: better no tip than a tip on the wrong horse
+        if containing:
+            return runners[containing[0]]
+
+        close = difflib.get_close_matches(name, list(runners), n=1, cutoff=FUZZY_CUTOFF)
+        return runners[close[0]] if close else None
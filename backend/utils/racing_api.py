@@ -7,30 +7,88 @@ Wrapper for The Racing API with proper authentication and rate limiting
 import os
 import httpx
 import asyncio
-from typing import List, Dict, Optional
-from datetime import datetime, date
+from typing import Callable, List, Dict, Optional, Set
+from datetime import datetime, date, timedelta
 from loguru import logger
 import base64
 
 from models.database import Meet, Race, Runner
-
-BASE_URL = "https://api.theracingapi.com/v1"
-RATE_LIMIT_DELAY = 0.5  # 2 requests per second = 500ms delay
+from utils.rate_limiter import TokenBucket
+from utils.response_cache import ResponseCache
+from utils.cassette import Cassette
+from utils.fingerprints import FingerprintStore
+from utils.resilience import (
+    CircuitOpenError,
+    backoff_delay,
+    get_circuit_breaker,
+    is_retryable,
+    parse_retry_after,
+)
+
+API_HOST = "api.theracingapi.com"
+BASE_URL = f"https://{API_HOST}/v1"
+RATE_LIMIT_PER_SECOND = float(os.getenv("RACINGAPI_RATE_LIMIT", 2))  # Contracted: 2 requests per second
+RATE_LIMIT_BURST = float(os.getenv("RACINGAPI_RATE_BURST", 1))
+# Bucket state shared by sharded worker processes (see SharedTokenBucket)
+RATE_LIMIT_STATE_FILE = os.getenv("RACINGAPI_RATE_LIMIT_STATE", "cache/racing_api_rate_limit.json")
+REQUEST_TIMEOUT = 30.0
+
+# Connection pool sizing for the shared client
+MAX_CONNECTIONS = int(os.getenv("RACINGAPI_MAX_CONNECTIONS", 10))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("RACINGAPI_MAX_KEEPALIVE", 5))
+KEEPALIVE_EXPIRY = float(os.getenv("RACINGAPI_KEEPALIVE_EXPIRY", 30))
+
+# Retries with jittered exponential backoff for transient failures
+MAX_RETRIES = int(os.getenv("RACINGAPI_MAX_RETRIES", 3))
+RETRY_BASE_DELAY = float(os.getenv("RACINGAPI_RETRY_BASE_DELAY", 0.5))
+RETRY_MAX_DELAY = float(os.getenv("RACINGAPI_RETRY_MAX_DELAY", 30))
+
+# Circuit breaker: open after N consecutive failures, probe again after the reset timeout
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("RACINGAPI_BREAKER_THRESHOLD", 5))
+BREAKER_RESET_TIMEOUT = float(os.getenv("RACINGAPI_BREAKER_RESET_SECONDS", 60))
+
+# On-disk response cache (set RACINGAPI_CACHE_DIR="" to disable)
+CACHE_DIR = os.getenv("RACINGAPI_CACHE_DIR", "cache/racing_api")
+CACHE_TTL = float(os.getenv("RACINGAPI_CACHE_TTL", 900))  # Used when the API sends no ETag/Last-Modified
+
+# Record/replay cassette for Racing API responses: off, record or replay
+CASSETTE_MODE = os.getenv("RACINGAPI_CASSETTE_MODE", "off")
+CASSETTE_DIR = os.getenv("RACINGAPI_CASSETTE_DIR", "fixtures/racing_api")
+CASSETTE_LATENCY = float(os.getenv("RACINGAPI_CASSETTE_LATENCY", 0.15))  # Seconds per replayed response
+CASSETTE_JITTER = float(os.getenv("RACINGAPI_CASSETTE_JITTER", 0.1))
 
 class RacingAPIClient:
     """
     Client for The Racing API
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache_dir: Optional[str] = CACHE_DIR,
+        cassette: Optional[Cassette] = None,
+        fingerprints_file: str = "race_fingerprints.json"
+    ):
         self.username = os.getenv("RACINGAPI_USERNAME")
         self.password = os.getenv("RACINGAPI_PASSWORD")
 
-        if not self.username or not self.password:
+        # Record/replay fixtures (replay needs no credentials or network)
+        if cassette is None and CASSETTE_MODE != "off":
+            cassette = Cassette(CASSETTE_DIR, CASSETTE_MODE, CASSETTE_LATENCY, CASSETTE_JITTER)
+        self.cassette = cassette
+
+        replaying = self.cassette is not None and self.cassette.replaying
+        if not replaying and (not self.username or not self.password):
             raise ValueError("RACINGAPI_USERNAME and RACINGAPI_PASSWORD must be set")
 
+        # Replayed race times move forward by the time since recording, so
+        # races aren't dropped as long started (fixed for this client's life)
+        self.time_shift: timedelta = self.cassette.time_shift() if self.cassette else timedelta(0)
+        if self.time_shift:
+            logger.info(f"Replaying race times shifted by {self.time_shift}")
+
         # Create auth header
-        credentials = f"{self.username}:{self.password}"
+        credentials = f"{self.username or ''}:{self.password or ''}"
         encoded = base64.b64encode(credentials.encode()).decode()
         self.auth_header = f"Basic {encoded}"
 
@@ -39,36 +97,220 @@ class RacingAPIClient:
             "Content-Type": "application/json"
         }
 
+        # Pooled HTTP/2 client, created lazily on first use so it binds to
+        # the running event loop. Closed via aclose().
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Token bucket shared by every coroutine using this client
+        self.rate_limiter = rate_limiter or TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+        # Retry counters and the breaker shared by every client for this host
+        self.retries = 0
+        self.retries_exhausted = 0
+        self.circuit_breaker = get_circuit_breaker(
+            API_HOST,
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=BREAKER_RESET_TIMEOUT
+        )
+
+        # Conditional-request cache of parsed responses
+        self.cache: Optional[ResponseCache] = ResponseCache(cache_dir) if cache_dir else None
+
+        # Per-race fingerprint of runners + odds, persisted next to the cache
+        self.race_fingerprints = FingerprintStore(
+            os.path.join(cache_dir, fingerprints_file) if cache_dir else None
+        )
+
         logger.info("Racing API client initialized")
 
-    async def _request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+    def _get_client(self) -> httpx.AsyncClient:
         """
-        Make authenticated request to Racing API with rate limiting
+        Return the shared pooled client, creating it if needed
         """
-        url = f"{BASE_URL}{endpoint}"
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    params=params or {},
-                    timeout=30.0
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                headers=self.headers,
+                http2=True,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
                 )
+            )
+        return self._client
 
-                response.raise_for_status()
+    async def aclose(self):
+        """
+        Close the pooled HTTP client and its open connections
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.debug("Racing API client closed")
+        self._client = None
 
-                # Rate limiting
-                await asyncio.sleep(RATE_LIMIT_DELAY)
+    async def __aenter__(self):
+        return self
 
-                return response.json()
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
 
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error from Racing API: {e.response.status_code} - {e.response.text}")
-            raise
-        except Exception as e:
-            logger.error(f"Error calling Racing API: {e}")
-            raise
+    def stats(self) -> Dict:
+        """
+        Client counters for the run log
+        """
+        stats = {
+            "rate_limiter": self.rate_limiter.stats(),
+            "retries": {"retried": self.retries, "exhausted": self.retries_exhausted},
+            "circuit_breaker": self.circuit_breaker.stats(),
+        }
+        if self.cache:
+            stats["cache"] = self.cache.stats()
+        if self.cassette:
+            stats["cassette"] = self.cassette.stats()
+        stats["race_fingerprints"] = self.race_fingerprints.stats()
+        return stats
+
+    async def _send_once(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> httpx.Response:
+        """
+        Make a single rate-limited request (or replay one from the cassette)
+        """
+        # Rate limiting
+        await self.rate_limiter.acquire()
+
+        if self.cassette and self.cassette.replaying:
+            response = await self.cassette.replay(endpoint, params, f"{BASE_URL}{endpoint}")
+        else:
+            if self.cassette and self.cassette.recording:
+                # Record full bodies, never 304s
+                headers = None
+
+            client = self._get_client()
+            response = await client.get(endpoint, params=params or {}, headers=headers)
+
+            if self.cassette and self.cassette.recording:
+                self.cassette.record(endpoint, params, response)
+
+        if response.status_code != 304:
+            response.raise_for_status()
+
+        return response
+
+    async def _send(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> httpx.Response:
+        """
+        Make authenticated request to Racing API with rate limiting
+
+        Timeouts, connection errors, 429 and 5xx responses are retried with
+        jittered exponential backoff, honouring Retry-After. While the host's
+        circuit breaker is open, calls fail fast with CircuitOpenError.
+        A 304 Not Modified is returned to the caller rather than raised.
+        """
+        attempt = 0
+
+        while True:
+            if not self.circuit_breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {API_HOST}, skipping {endpoint}")
+
+            try:
+                response = await self._send_once(endpoint, params, headers)
+
+            except Exception as e:
+                if not is_retryable(e):
+                    if isinstance(e, httpx.HTTPStatusError):
+                        # The upstream answered, so it is healthy
+                        self.circuit_breaker.record_success()
+                        logger.error(f"HTTP error from Racing API: {e.response.status_code} - {e.response.text}")
+                    else:
+                        logger.error(f"Error calling Racing API: {e}")
+                    raise
+
+                self.circuit_breaker.record_failure()
+
+                if attempt >= MAX_RETRIES:
+                    self.retries_exhausted += 1
+                    logger.error(f"Racing API {endpoint} failed after {attempt + 1} attempts: {e}")
+                    raise
+
+                retry_after = None
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+
+                delay = backoff_delay(attempt, RETRY_BASE_DELAY, RETRY_MAX_DELAY, retry_after)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    f"Racing API {endpoint} failed ({e!r}); "
+                    f"retry {attempt}/{MAX_RETRIES} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.circuit_breaker.record_success()
+            return response
+
+    async def _request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Make a request and return the JSON body
+        """
+        response = await self._send(endpoint, params)
+        return response.json()
+
+    async def _cached_races(
+        self,
+        endpoint: str,
+        parse: Callable[[Dict], List[Race]],
+        params: Optional[Dict] = None,
+        ttl: float = CACHE_TTL
+    ) -> List[Race]:
+        """
+        Request an endpoint that yields races, serving parsed races from cache
+
+        Entries with an ETag/Last-Modified are revalidated with a conditional
+        request; entries without validators are reused until the TTL expires.
+        Hits and 304s skip parsing entirely. With a cassette the cache is
+        bypassed: recording must reach the network to write every fixture,
+        and replayed races are re-timed on each run.
+        """
+        if self.cache is None or self.cassette is not None:
+            return parse(await self._request(endpoint, params))
+
+        entry = self.cache.get(endpoint, params)
+        if entry and entry.is_fresh():
+            self.cache.hits += 1
+            return [Race(**race) for race in entry.parsed]
+
+        headers = entry.conditional_headers() if entry else None
+        response = await self._send(endpoint, params, headers)
+
+        if response.status_code == 304 and entry:
+            self.cache.revalidated += 1
+            self.cache.touch(endpoint, params)
+            return [Race(**race) for race in entry.parsed]
+
+        self.cache.misses += 1
+        races = parse(response.json())
+
+        # Timestamps are per-run, so let them default on load
+        self.cache.put(
+            endpoint,
+            params,
+            [race.dict(exclude={'created_at', 'updated_at'}) for race in races],
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            ttl=ttl
+        )
+        return races
 
     async def get_todays_meets(self) -> List[Meet]:
         """
@@ -103,12 +345,13 @@ class RacingAPIClient:
         Get all races for a specific meet
         """
         try:
-            data = await self._request(f"/australia/meets/{meet_id}/races")
-
-            races = []
-            for race_data in data.get("races", []):
-                race = self._parse_race(meet_id, race_data)
-                races.append(race)
+            races = await self._cached_races(
+                f"/australia/meets/{meet_id}/races",
+                lambda data: [
+                    self._parse_race(meet_id, race_data)
+                    for race_data in data.get("races", [])
+                ]
+            )
 
             logger.info(f"Fetched {len(races)} races for meet {meet_id}")
             return races
@@ -117,15 +360,32 @@ class RacingAPIClient:
             logger.error(f"Error fetching races for meet {meet_id}: {e}")
             return []
 
-    async def get_race_details(self, meet_id: str, race_number: int) -> Race:
+    async def get_race_details(
+        self,
+        meet_id: str,
+        race_number: int,
+        skip_unchanged: bool = False
+    ) -> Optional[Race]:
         """
         Get detailed race information including odds
+
+        With skip_unchanged, returns None without parsing when the runners and
+        odds payload matches the fingerprint committed on a previous run.
+        Call commit_race() once every odds row of the returned race has been
+        saved. The fingerprint only says whether the odds need writing again;
+        tips can change while odds don't.
         """
         try:
             data = await self._request(
                 f"/australia/meets/{meet_id}/races/{race_number}"
             )
 
+            race_id = f"{meet_id}-{race_number}"
+            fingerprint = FingerprintStore.fingerprint(data.get("runners", []))
+            if self.race_fingerprints.is_unchanged(race_id, fingerprint) and skip_unchanged:
+                logger.debug(f"Race {race_id} unchanged since last run")
+                return None
+
             race = self._parse_race_with_odds(meet_id, data)
             logger.info(f"Fetched details for race {meet_id}-{race_number}")
             return race
@@ -134,6 +394,30 @@ class RacingAPIClient:
             logger.error(f"Error fetching race details: {e}")
             raise
 
+    def commit_race(self, race_id: str):
+        """
+        Record a race's latest fingerprint once its odds are saved
+        """
+        self.race_fingerprints.commit(race_id)
+
+    def race_fingerprint(self, race_id: str) -> Optional[str]:
+        """
+        Fingerprint of the race's latest runners + odds payload (None if never fetched)
+        """
+        return self.race_fingerprints.current(race_id)
+
+    def forget_races(self, race_ids: Set[str]):
+        """
+        Drop fingerprints of races that no longer need refreshing (e.g. jumped)
+        """
+        self.race_fingerprints.drop(lambda key: key in race_ids)
+
+    def save_fingerprints(self):
+        """
+        Persist race fingerprints for the next run
+        """
+        self.race_fingerprints.save()
+
     def _parse_race(self, meet_id: str, race_data: Dict) -> Race:
         """
         Parse race data from API response (without detailed odds)
@@ -156,7 +440,7 @@ class RacingAPIClient:
 
         # Parse start time
         start_time_str = race_data.get("race_time")
-        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
+        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00')) + self.time_shift
 
         race = Race(
             id=race_id,
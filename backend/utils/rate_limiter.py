@@ -0,0 +1,141 @@
+"""
+Async Token-Bucket Rate Limiter
+
+Shared limiter for outbound API calls. Coroutines reserve a token before
+each request; when the bucket is empty they sleep only as long as needed
+for their token to refill, so several requests can be in flight while the
+start rate stays at the contracted limit.
+
+SharedTokenBucket keeps the bucket in a lock-protected state file so
+several worker processes (e.g. aggregator shards) share one limit.
+"""
+
+import os
+import json
+import asyncio
+import time
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every coroutine in the event loop
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A token is reserved synchronously (no await between refill and
+    consume), so no lock is needed and callers are served in arrival order.
+    """
+
+    # Clock used for refills; shared buckets need one comparable across processes
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = self._clock()
+
+        # Counters
+        self.acquired = 0
+        self.throttled = 0
+        self.tokens_waited = 0.0
+        self.wait_seconds = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens and return how long the caller must wait before using them
+        """
+        self._refill()
+        self._tokens -= tokens
+        self.acquired += 1
+
+        if self._tokens >= 0:
+            return 0.0
+
+        # Bucket went into debt: wait until it is paid back
+        deficit = -self._tokens
+        delay = deficit / self.rate
+        self.throttled += 1
+        self.tokens_waited += min(deficit, tokens)
+        self.wait_seconds += delay
+        return delay
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until the requested tokens are available
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "rate": self.rate,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "tokens_waited": round(self.tokens_waited, 2),
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by every process pointing at the same state file
+
+    Each reservation loads the bucket, reserves and stores it back while
+    holding an exclusive flock on the file. The lock is only held for the
+    bookkeeping, never while waiting for a token.
+    """
+
+    _clock = staticmethod(time.time)
+
+    def __init__(self, path: str, rate: float, capacity: float = 1.0):
+        if fcntl is None:
+            raise RuntimeError("SharedTokenBucket requires fcntl (POSIX only)")
+
+        super().__init__(rate, capacity)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+
+                # No state yet (or unreadable): start from a full bucket
+                self._tokens = state.get("tokens", self.capacity)
+                self._updated = state.get("updated", self._clock())
+
+                delay = super().reserve(tokens)
+
+                f.seek(0)
+                f.truncate()
+                json.dump({"tokens": self._tokens, "updated": self._updated}, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        return delay
@@ -0,0 +1,157 @@
+"""
+Retry and Circuit Breaker Helpers
+
+Exponential backoff with full jitter (honouring Retry-After) for transient
+upstream failures, and a per-host circuit breaker that fails fast while
+an upstream is down instead of spending the full timeout on every call.
+"""
+
+import time
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+import httpx
+
+# Status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Transient errors: timeouts, connection failures, 429 and 5xx
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date) into seconds
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Full-jitter exponential backoff; Retry-After is treated as a floor
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed    -> calls pass through; `failure_threshold` consecutive
+                 failures open the circuit
+    open      -> calls are rejected until `reset_timeout` has elapsed
+    half_open -> a single trial call is allowed; success closes the
+                 circuit, failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+
+        # Stats
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Whether a call may proceed right now
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            # A trial that never reported back (e.g. cancelled) expires
+            trial_expired = time.monotonic() - self._trial_started >= self.reset_timeout
+            if self._trial_in_flight and not trial_expired:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            self._trial_started = time.monotonic()
+
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+# One breaker per upstream host, shared by every client in the process
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str, **kwargs) -> CircuitBreaker:
+    """
+    Return the shared breaker for a host, creating it on first use
+    """
+    if host not in _breakers:
+        _breakers[host] = CircuitBreaker(host, **kwargs)
+    return _breakers[host]
@@ -0,0 +1,146 @@
+"""
+On-disk HTTP Response Cache
+
+Stores API responses keyed by endpoint + params, together with their
+ETag / Last-Modified validators so they can be revalidated with a
+conditional request. Responses without validators expire after a TTL.
+Callers may store a parsed form alongside the payload so cache hits skip
+parsing entirely.
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from utils.atomic_file import write_json_atomic
+
+
+def json_default(value):
+    """Serialize datetimes/dates the same way the database layer does"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CacheEntry:
+    """A cached response and its revalidation metadata"""
+
+    def __init__(self, data: Dict):
+        self.etag: Optional[str] = data.get("etag")
+        self.last_modified: Optional[str] = data.get("last_modified")
+        self.stored_at: float = data.get("stored_at", 0.0)
+        self.ttl: float = data.get("ttl", 0.0)
+        self.parsed: Any = data.get("parsed")
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self) -> bool:
+        """Entries without validators are served until their TTL expires"""
+        return not self.has_validators and time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    JSON-file cache, one file per endpoint + params key
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # Stats
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict] = None) -> str:
+        raw = json.dumps([endpoint, params or {}], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[CacheEntry]:
+        """
+        Load a cached entry, or None if missing/corrupt
+        """
+        path = self._path(self.key(endpoint, params))
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                return CacheEntry(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            return None
+
+    def put(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        parsed: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: float = 0.0
+    ):
+        """
+        Store the parsed form of a response with its validators
+        """
+        path = self._path(self.key(endpoint, params))
+        entry = {
+            "endpoint": endpoint,
+            "params": params or {},
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "ttl": ttl,
+            "parsed": parsed,
+        }
+
+        try:
+            write_json_atomic(path, entry, default=json_default)
+            self.stores += 1
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write cache entry for {endpoint}: {e}")
+
+    def touch(self, endpoint: str, params: Optional[Dict] = None):
+        """
+        Mark an entry as just revalidated
+        """
+        path = self._path(self.key(endpoint, params))
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            entry["stored_at"] = time.time()
+            write_json_atomic(path, entry)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not refresh cache entry for {endpoint}: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Counters for the run log
+        """
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+        }
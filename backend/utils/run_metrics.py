@@ -0,0 +1,175 @@
+"""
+Per-Stage Run Metrics
+
+Records wall-clock, CPU time, item counts, throughput and memory for
+each stage of a worker run, emits a machine-readable JSON summary at the
+end, and optionally writes a cProfile dump per stage.
+
+Memory per stage is the highest current RSS sampled (from /proc) each
+time a worker enters or leaves the stage. The process's lifetime peak
+RSS (ru_maxrss) is only reported once, for the whole run.
+
+Stages may be entered by several concurrent workers at once; a stage's
+wall-clock and CPU time cover the span during which at least one worker
+was inside it. CPU time is process-wide, so overlapping stages share it.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from loguru import logger
+
+from utils.atomic_file import write_json_atomic
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Current resident set size of this process, in MB
+
+    Returns None where /proc isn't available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process so far, in MB
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageMetrics:
+    """Timing and counters for one stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.max_rss_mb: Optional[float] = None
+
+        self._active = 0
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def _sample_rss(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.max_rss_mb = max(self.max_rss_mb or 0.0, rss)
+
+    def _enter(self):
+        self._sample_rss()
+        if self._active == 0:
+            self._wall_start = time.perf_counter()
+            self._cpu_start = time.process_time()
+        self._active += 1
+
+    def _exit(self):
+        self._active -= 1
+        if self._active == 0:
+            self.wall_seconds += time.perf_counter() - self._wall_start
+            self.cpu_seconds += time.process_time() - self._cpu_start
+        self._sample_rss()
+
+    def to_dict(self) -> Dict:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "items": self.items,
+            "items_per_second": round(self.items / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "max_rss_mb": self.max_rss_mb,
+        }
+
+
+class RunMetrics:
+    """
+    Stage metrics for one worker run
+    """
+
+    def __init__(self, worker: str, metrics_dir: Optional[str] = None, profile_dir: Optional[str] = None):
+        self.worker = worker
+        self.metrics_dir = metrics_dir
+        self.profile_dir = profile_dir
+        self.started_at = datetime.now(timezone.utc)
+        self.stages: Dict[str, StageMetrics] = {}
+
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name: str, profile: bool = False) -> Iterator[StageMetrics]:
+        """
+        Measure a stage; with profile=True and profiling enabled, also dump
+        a cProfile of it to <profile_dir>/<worker>-<stage>.prof
+
+        Only profile stages that don't overlap others: one profiler can be
+        active per thread.
+        """
+        metrics = self.stages.setdefault(name, StageMetrics(name))
+
+        profiler = cProfile.Profile() if profile and self.profile_dir else None
+        if profiler:
+            profiler.enable()
+
+        metrics._enter()
+        try:
+            yield metrics
+        finally:
+            metrics._exit()
+            if profiler:
+                profiler.disable()
+                path = os.path.join(self.profile_dir, f"{self.worker}-{name}.prof")
+                profiler.dump_stats(path)
+                logger.info(f"Wrote profile for stage '{name}' to {path}")
+
+    def summary(self) -> Dict:
+        """
+        Machine-readable run summary
+        """
+        return {
+            "worker": self.worker,
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._wall_start, 3),
+            "cpu_seconds": round(time.process_time() - self._cpu_start, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+        }
+
+    def emit(self) -> Dict:
+        """
+        Log the JSON summary and write it to the metrics directory
+        """
+        summary = self.summary()
+        logger.info(f"Run metrics: {json.dumps(summary)}")
+
+        if self.metrics_dir:
+            try:
+                stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+                path = os.path.join(self.metrics_dir, f"{self.worker}-{stamp}.json")
+                write_json_atomic(path, summary, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not write run metrics: {e}")
+
+        return summary
@@ -1,7 +1,7 @@
 """
 Automated Racing Data Aggregator Worker
 
-This script runs on a schedule to:
+This script runs on a schedule (or continuously with --poll) to:
 1. Fetch today's Australian race meetings from The Racing API
 2. Scrape expert tips from public sources using Playwright
 3. Use Claude AI to analyze tips and extract confidence scores
@@ -9,14 +9,28 @@ This script runs on a schedule to:
 5. Save everything to Supabase
 
 Usage:
-    python workers/aggregator.py
+    python workers/aggregator.py           # Run on schedule
+    python workers/aggregator.py --once    # Run once and exit
+    python workers/aggregator.py --once --resume   # Resume a crashed run from its checkpoints
+    python workers/aggregator.py --poll    # Poll continuously, tightening odds refreshes near the jump
+    python workers/aggregator.py --once --profile  # Also write cProfile dumps (see PROFILE_DIR)
+    python workers/aggregator.py --once --shards 4  # Split meets across 4 worker processes
+    python workers/aggregator.py --once --shards 4 --shard-index 0  # Run a single shard
+
+    # Replay a recorded race day's Racing API traffic (see RACINGAPI_CASSETTE_*).
+    # Only Racing API calls are replayed: tip sites, Claude and Supabase are
+    # still contacted, so the run needs network access and credentials.
+    RACINGAPI_CASSETTE_MODE=replay python workers/aggregator.py --once
 """
 
 import asyncio
+import hashlib
+import json
 import os
+import subprocess
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import datetime, date
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Set, Tuple
 from loguru import logger
 import schedule
 import time
@@ -24,150 +38,811 @@ import time
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.racing_api import RacingAPIClient
+from utils.racing_api import RacingAPIClient, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_STATE_FILE
+from utils.rate_limiter import SharedTokenBucket
 from scrapers.tips_scraper import TipsScraper
 from utils.claude_analyzer import ClaudeAnalyzer
 from utils.database import SupabaseClient
-from models.database import Race, ExpertTip, ConsensusScore, RaceOdds
+from utils.odds_scheduler import OddsRefreshQueue
+from utils.fingerprints import FingerprintStore
+from utils.checkpoint import CheckpointStore
+from utils.run_metrics import RunMetrics
+from utils.browser_service import get_browser_service
+from utils.parse_pool import shutdown_parse_executor
+from utils.response_cache import json_default
+from utils.atomic_file import write_json_atomic
+from models.database import Meet, Race, ExpertTip, ConsensusScore, RaceOdds
 
 # Configure logging
 logger.add("logs/worker.log", rotation="500 MB", retention="10 days", level="INFO")
 
+# Number of meets fetched from the Racing API at once
+MEET_FETCH_CONCURRENCY = int(os.getenv("MEET_FETCH_CONCURRENCY", 4))
+
+# Races whose odds are fetched at once (soonest jump first)
+ODDS_FETCH_CONCURRENCY = int(os.getenv("ODDS_FETCH_CONCURRENCY", 4))
+
+# Streaming pipeline: bounded queue size between stages and Claude worker counts
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 20))
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", 2))
+VERDICT_CONCURRENCY = int(os.getenv("VERDICT_CONCURRENCY", 2))
+
+# Per-stage checkpoints for --resume (set CHECKPOINT_DB="" to disable)
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "cache/checkpoints.sqlite3")
+
+# Per-race fingerprint of the odds + tips behind its analysis, consensus and
+# verdicts, committed once all of them succeeded; races whose inputs are
+# unchanged since are skipped after the odds step (set RACE_INPUTS_FILE=""
+# to keep it in memory only)
+RACE_INPUTS_FILE = os.getenv("RACE_INPUTS_FILE", "cache/race_inputs.json")
+
+# Polling mode (--poll): odds cadence follows ODDS_STALENESS_BUCKETS; meets and
+# tips are re-fetched on these fixed intervals (seconds)
+POLL_RACES_INTERVAL = float(os.getenv("POLL_RACES_INTERVAL", 1800))
+POLL_TIPS_INTERVAL = float(os.getenv("POLL_TIPS_INTERVAL", 900))
+POLL_MIN_SLEEP = float(os.getenv("POLL_MIN_SLEEP", 15))
+POLL_MAX_SLEEP = float(os.getenv("POLL_MAX_SLEEP", 300))
+
+# Sharded runs: the supervisor scrapes tips once and shards wait this long
+# (seconds) for them before carrying on without tips
+SHARD_TIPS_TIMEOUT = float(os.getenv("SHARD_TIPS_TIMEOUT", 900))
+
+# Per-stage timing/throughput summaries (JSON) and --profile cProfile dumps
+METRICS_DIR = os.getenv("METRICS_DIR", "logs/metrics")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+
+def meet_shard(meet_id: str, shards: int) -> int:
+    """
+    Stable shard index for a meet (same in every process and run)
+    """
+    digest = hashlib.sha1(meet_id.encode()).hexdigest()
+    return int(digest, 16) % shards
+
 class RacingAggregator:
     """
     Main aggregator class that orchestrates the data pipeline
+
+    With shards > 1 this instance only handles meets where
+    meet_shard(meet.id, shards) == shard_index. A meet's races, odds, tips,
+    consensus and verdicts all stay in its shard, so consensus always sees
+    complete races. Shards share the Racing API rate limit through a
+    file-locked token bucket.
+
+    With races_file, today's meets and race lists are read from the file
+    the shard supervisor wrote before starting the shards, instead of being
+    fetched again by every shard. With tips_file, tips are not scraped
+    here: scrape_tips() waits for the supervisor to write every source's
+    parsed tips to that file (see run_sharded) and keeps the ones for this
+    instance's races.
     """
 
-    def __init__(self):
-        self.racing_api = RacingAPIClient()
+    def __init__(
+        self,
+        resume: bool = False,
+        profile: bool = False,
+        shards: int = 1,
+        shard_index: int = 0,
+        races_file: Optional[str] = None,
+        tips_file: Optional[str] = None
+    ):
+        if not 0 <= shard_index < shards:
+            raise ValueError(f"shard index {shard_index} out of range for {shards} shards")
+
+        self.resume = resume
+        self.shards = shards
+        self.shard_index = shard_index
+        self.races_file = races_file
+        self.tips_file = tips_file
+
+        if shards > 1:
+            suffix = f".shard-{shard_index}-of-{shards}"
+            self.racing_api = RacingAPIClient(
+                rate_limiter=SharedTokenBucket(RATE_LIMIT_STATE_FILE, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST),
+                fingerprints_file=f"race_fingerprints{suffix}.json"
+            )
+        else:
+            suffix = ""
+            self.racing_api = RacingAPIClient()
         self.tips_scraper = TipsScraper()
         self.claude = ClaudeAnalyzer()
         self.db = SupabaseClient()
+        self.odds_queue = OddsRefreshQueue()
+
+        # Change tracking so repeated cycles only recompute what moved
+        self.meet_fingerprints = FingerprintStore()
+        self.consensus_fingerprints = FingerprintStore()
+        self.analyzed_tips: Dict[str, ExpertTip] = {}
+        self.verdicts: Dict[str, Tuple[str, str]] = {}  # {runner key: (inputs fingerprint, verdict)}
+        self.race_inputs = FingerprintStore(
+            RACE_INPUTS_FILE.replace(".json", f"{suffix}.json") if RACE_INPUTS_FILE else None
+        )
+
+        # Stage checkpoints (one file per shard), opened by run()
+        self.checkpoint_db = CHECKPOINT_DB.replace(".sqlite3", f"{suffix}.sqlite3") if CHECKPOINT_DB else ""
+        self.checkpoints: Optional[CheckpointStore] = None
+
+        # Per-stage timing, emitted at the end of run()
+        self.metrics = RunMetrics(f"racing{suffix}", METRICS_DIR, PROFILE_DIR if profile else None)
+
+    async def aclose(self):
+        """
+        Release long-lived resources (pooled HTTP connections, warm browser, parse workers)
+        """
+        await self.racing_api.aclose()
+        await self.tips_scraper.aclose()
+        await get_browser_service().close()
+        shutdown_parse_executor()
+        if self.checkpoints:
+            self.checkpoints.close()
 
     async def run(self):
         """
         Main execution flow
+
+        Races stream through fetch → odds → tips → analysis → consensus →
+        verdict as soon as their inputs are ready (see _run_pipeline).
         """
         try:
             logger.info("=" * 60)
             logger.info("Starting Racing Aggregator Run")
             logger.info(f"Timestamp: {datetime.now().isoformat()}")
+            if self.shards > 1:
+                logger.info(f"Shard {self.shard_index + 1} of {self.shards}")
+            logger.info("=" * 60)
+
+            if self.checkpoint_db:
+                self.checkpoints = CheckpointStore(self.checkpoint_db)
+                if self.resume:
+                    logger.info(f"Resuming from checkpoints for {self.checkpoints.run_date}")
+                else:
+                    self.checkpoints.clear()
+
+            # Stages interleave, so --profile covers the pipeline as a whole
+            with self.metrics.stage("pipeline", profile=True) as pipeline:
+                counts = await self._run_pipeline()
+                pipeline.items = counts["races"]
+
+            if not counts["races"]:
+                logger.warning("No races found for today.")
+            elif not counts["changed"] and not counts["analyzed"]:
+                logger.info("No races changed since the last run.")
+
+            logger.info(f"✓ Fetched {counts['races']} races")
+            logger.info(f"✓ Odds fetched and saved for {counts['changed']} changed races")
+            logger.info(f"✓ Skipped {counts['unchanged']} races whose odds and tips are unchanged")
+            logger.info(f"✓ Scraped {counts['tips']} expert tips")
+            logger.info(f"✓ Analyzed {counts['analyzed']} tips")
+            logger.info(f"✓ Generated {counts['consensus']} consensus scores")
+            logger.info(f"✓ Generated {counts['verdicts']} AI verdicts")
+
+            logger.info("=" * 60)
+            logger.info("Aggregator run completed successfully!")
             logger.info("=" * 60)
 
-            # Step 1: Fetch race meetings and races
-            logger.info("Step 1: Fetching today's race meetings...")
-            races = await self.fetch_races()
-            logger.info(f"✓ Fetched {len(races)} races")
+        except Exception as e:
+            logger.error(f"Error in aggregator run: {e}", exc_info=True)
+            raise
 
-            if not races:
-                logger.warning("No races found for today. Exiting.")
-                return
+        finally:
+            logger.info(f"Racing API client stats: {self.racing_api.stats()}")
+            logger.info(f"Odds refresh queue stats: {self.odds_queue.stats()}")
+            logger.info(f"Tips scraper stats: {self.tips_scraper.stats()}")
+            logger.info(f"Browser stats: {get_browser_service().stats()}")
+            if self.checkpoints:
+                logger.info(f"Checkpoint stats: {self.checkpoints.stats()}")
+            self.metrics.emit()
 
-            # Step 2: Fetch odds for all races
-            logger.info("Step 2: Fetching odds for all races...")
-            await self.fetch_and_save_odds(races)
-            logger.info("✓ Odds fetched and saved")
+    async def _checkpointed(
+        self,
+        stage: str,
+        key: str,
+        inputs: Any,
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda payload: payload,
+        store_if: Callable[[Any], bool] = lambda value: True
+    ) -> Any:
+        """
+        Run one stage step, reusing its checkpointed output when resuming
 
-            # Step 3: Scrape expert tips
-            logger.info("Step 3: Scraping expert tips...")
-            tips = await self.scrape_tips(races)
-            logger.info(f"✓ Scraped {len(tips)} expert tips")
+        The output is only checkpointed after compute() (including its
+        database writes) has finished, and only when store_if accepts it,
+        so failed or empty steps are retried on resume.
+        """
+        if self.checkpoints:
+            found, payload = self.checkpoints.get(stage, key, inputs)
+            if found:
+                return decode(payload)
 
-            if not tips:
-                logger.warning("No tips found. Skipping consensus calculation.")
-                return
+        value = await compute()
 
-            # Step 4: Analyze tips with Claude AI
-            logger.info("Step 4: Analyzing tips with Claude AI...")
-            analyzed_tips = await self.analyze_tips(tips)
-            logger.info(f"✓ Analyzed {len(analyzed_tips)} tips")
+        if self.checkpoints and store_if(value):
+            self.checkpoints.put(stage, key, inputs, encode(value))
 
-            # Step 5: Calculate consensus scores
-            logger.info("Step 5: Calculating consensus scores...")
-            consensus_scores = await self.calculate_consensus(analyzed_tips, races)
-            logger.info(f"✓ Generated {len(consensus_scores)} consensus scores")
+        return value
 
-            # Step 6: Generate AI verdicts
-            logger.info("Step 6: Generating AI verdicts...")
-            await self.generate_verdicts(consensus_scores)
-            logger.info("✓ AI verdicts generated")
+    async def _run_pipeline(self) -> Dict[str, int]:
+        """
+        Stream races through the pipeline stages
+
+        fetch      meets fetched concurrently; each meet's races are pushed
+                   onto the odds refresh queue as soon as they arrive
+        odds       ODDS_FETCH_CONCURRENCY workers, soonest jump first
+        tips       scraped once the race list is complete, in parallel with odds
+        analysis   ANALYSIS_CONCURRENCY workers, per race once its tips are in,
+                   unless its odds and tips match self.race_inputs (the inputs
+                   of its last fully processed run)
+        consensus  per race as soon as its tips are analyzed
+        verdict    VERDICT_CONCURRENCY workers, per runner
+
+        Bounded queues between odds/analysis/consensus/verdict apply
+        backpressure: a slow Claude stage throttles odds fetching rather than
+        buffering the whole day. Races whose odds land before the tips are
+        in wait in memory instead (the race list is held there anyway), so
+        odds keep flowing while the scrapers run.
+
+        Every per-race step is checkpointed, so a resumed run skips straight
+        to the first incomplete race/stage. A race's inputs fingerprint is
+        only committed once its analysis, consensus and every verdict have
+        succeeded, so a crash or failure after the odds step is recomputed
+        by the next normal run. Each stage's active time and
+        item count is recorded in self.metrics.
+
+        Returns:
+            Item counts per stage
+        """
+        counts = {
+            "races": 0, "changed": 0, "unchanged": 0, "tips": 0,
+            "analyzed": 0, "consensus": 0, "verdicts": 0,
+        }
+
+        races: List[Race] = []
+        races_available = asyncio.Event()
+        fetch_done = asyncio.Event()
+        tips_by_race: Dict[str, List[ExpertTip]] = {}
+        tips_ready = asyncio.Event()
+        awaiting_tips: List[Race] = []  # odds done before the tips were in
+
+        analysis_queue: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        consensus_queue: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        verdict_queue: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+
+        # Verdicts outstanding per race, and races with a failed step; a
+        # race's inputs are committed when its last step finishes cleanly
+        verdicts_pending: Dict[str, int] = {}
+        incomplete: set = set()
+
+        def finish_race(race_id: str):
+            if race_id not in incomplete:
+                self.race_inputs.commit(race_id)
+
+        async def fetch_stage():
+            try:
+                with self.metrics.stage("fetch") as stage:
+                    async for meet_races in self.stream_races():
+                        races.extend(meet_races)
+                        counts["races"] += len(meet_races)
+                        stage.items += len(meet_races)
+                        self.odds_queue.push(meet_races)
+                        races_available.set()
+            finally:
+                fetch_done.set()
+                races_available.set()
+
+        async def odds_stage():
+            while True:
+                race = self.odds_queue.pop()
+                if race is None:
+                    if fetch_done.is_set():
+                        return
+                    races_available.clear()
+                    await races_available.wait()
+                    continue
 
-            logger.info("=" * 60)
-            logger.info("Aggregator run completed successfully!")
-            logger.info("=" * 60)
+                try:
+                    with self.metrics.stage("odds") as stage:
+                        detailed_race = await self._checkpointed(
+                            "odds",
+                            race.id,
+                            race.dict(exclude={'created_at', 'updated_at'}),
+                            lambda: self._refresh_race_odds(race),
+                            encode=lambda value: value.dict() if value else None,
+                            decode=lambda payload: Race(**payload) if payload else None
+                        )
+                        stage.items += 1
+                except Exception as e:
+                    logger.error(f"Error fetching odds for race {race.id}: {e}")
+                    continue
 
-        except Exception as e:
-            logger.error(f"Error in aggregator run: {e}", exc_info=True)
+                # Unchanged odds only skip the odds write; analysis decides
+                # whether the race's odds + tips moved
+                if detailed_race is not None:
+                    counts["changed"] += 1
+                if tips_ready.is_set():
+                    await analysis_queue.put(detailed_race or race)
+                else:
+                    awaiting_tips.append(detailed_race or race)
+
+        async def tips_stage():
+            await fetch_done.wait()
+            try:
+                if races:
+                    with self.metrics.stage("tips") as stage:
+                        tips = await self._checkpointed(
+                            "tips",
+                            "all",
+                            sorted(race.id for race in races),
+                            lambda: self.scrape_tips(races),
+                            encode=lambda value: [tip.dict() for tip in value],
+                            decode=lambda payload: [ExpertTip(**tip) for tip in payload],
+                            store_if=bool
+                        )
+                        stage.items = len(tips)
+                    counts["tips"] = len(tips)
+                    for tip in tips:
+                        tips_by_race.setdefault(tip.race_id, []).append(tip)
+            finally:
+                tips_ready.set()
+
+            # Odds workers queue directly from here on; hand over the races
+            # they finished while the tips were being scraped
+            while awaiting_tips:
+                await analysis_queue.put(awaiting_tips.pop(0))
+
+        async def analysis_stage():
+            while True:
+                race = await analysis_queue.get()
+                if race is None:
+                    return
+
+                race_tips = tips_by_race.get(race.id, [])
+                if not race_tips:
+                    continue
+
+                if self.race_inputs.is_unchanged(race.id, self._race_inputs(race, race_tips)):
+                    counts["unchanged"] += 1
+                    continue
+
+                try:
+                    with self.metrics.stage("analysis") as stage:
+                        analyzed_tips = await self._checkpointed(
+                            "analysis",
+                            race.id,
+                            [tip.raw_text for tip in race_tips],
+                            lambda: self.analyze_tips(race_tips),
+                            encode=lambda value: [tip.dict() for tip in value],
+                            decode=lambda payload: [ExpertTip(**tip) for tip in payload],
+                            store_if=bool
+                        )
+                        stage.items += len(analyzed_tips)
+                except Exception as e:
+                    logger.error(f"Error analyzing tips for race {race.id}: {e}")
+                    continue
+
+                counts["analyzed"] += len(analyzed_tips)
+                if len(analyzed_tips) < len(race_tips):
+                    incomplete.add(race.id)
+                if analyzed_tips:
+                    await consensus_queue.put((race, analyzed_tips))
+
+        async def consensus_stage():
+            while True:
+                item = await consensus_queue.get()
+                if item is None:
+                    return
+
+                race, analyzed_tips = item
+                try:
+                    with self.metrics.stage("consensus") as stage:
+                        consensus_scores = await self._checkpointed(
+                            "consensus",
+                            race.id,
+                            [tip.dict(exclude={'scraped_at'}) for tip in analyzed_tips],
+                            lambda: self.calculate_consensus(analyzed_tips, [race]),
+                            encode=lambda value: [consensus.dict() for consensus in value],
+                            decode=lambda payload: [ConsensusScore(**consensus) for consensus in payload]
+                        )
+                        stage.items += len(consensus_scores)
+                except Exception as e:
+                    logger.error(f"Error calculating consensus for race {race.id}: {e}")
+                    continue
+
+                counts["consensus"] += len(consensus_scores)
+                verdicts_pending[race.id] = len(consensus_scores)
+                if not consensus_scores:
+                    finish_race(race.id)
+                for consensus in consensus_scores:
+                    await verdict_queue.put(consensus)
+
+        async def verdict_stage():
+            while True:
+                consensus = await verdict_queue.get()
+                if consensus is None:
+                    return
+                generated = 0
+                try:
+                    with self.metrics.stage("verdict") as stage:
+                        generated = await self._checkpointed(
+                            "verdict",
+                            f"{consensus.race_id}:{consensus.runner_number}",
+                            self._verdict_inputs(consensus),
+                            lambda: self.generate_verdicts([consensus]),
+                            store_if=bool
+                        )
+                        stage.items += 1
+                except Exception as e:
+                    logger.error(
+                        f"Error generating verdict for race {consensus.race_id} "
+                        f"runner {consensus.runner_number}: {e}"
+                    )
+
+                if not (generated or consensus.ai_verdict):
+                    incomplete.add(consensus.race_id)
+                counts["verdicts"] += generated
+
+                verdicts_pending[consensus.race_id] -= 1
+                if not verdicts_pending[consensus.race_id]:
+                    finish_race(consensus.race_id)
+
+        async def close(queue: asyncio.Queue, workers: List[asyncio.Task]):
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+        async def drain():
+            # Drain stage by stage; sentinels stop each stage once upstream is done
+            await asyncio.gather(fetch_task, *odds_workers)
+            self.racing_api.save_fingerprints()
+            await tips_task
+            await close(analysis_queue, analysis_workers)
+            await close(consensus_queue, consensus_workers)
+            await close(verdict_queue, verdict_workers)
+
+        fetch_task = asyncio.create_task(fetch_stage())
+        tips_task = asyncio.create_task(tips_stage())
+        odds_workers = [asyncio.create_task(odds_stage()) for _ in range(ODDS_FETCH_CONCURRENCY)]
+        analysis_workers = [asyncio.create_task(analysis_stage()) for _ in range(ANALYSIS_CONCURRENCY)]
+        consensus_workers = [asyncio.create_task(consensus_stage())]
+        verdict_workers = [asyncio.create_task(verdict_stage()) for _ in range(VERDICT_CONCURRENCY)]
+        tasks = [fetch_task, tips_task, *odds_workers, *analysis_workers, *consensus_workers, *verdict_workers]
+
+        try:
+            # A stage task that dies would leave its upstream blocked on a full
+            # queue, so any task failing fails the whole pipeline
+            drain_task = asyncio.create_task(drain())
+            tasks.append(drain_task)
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             raise
 
+        finally:
+            self.race_inputs.save()
+
+        return counts
+
+    async def poll(self):
+        """
+        Continuous polling mode
+
+        Each cycle refreshes odds for races whose odds are stale for their
+        time-to-jump bucket, so the cadence tightens as the jump approaches.
+        Meets and tips are re-fetched on slower fixed intervals, and analysis,
+        consensus and verdicts are only recomputed for races whose odds or
+        tips changed.
+        """
+        logger.info("Starting Racing Aggregator polling mode")
+
+        races: List[Race] = []
+        # -inf: the first cycle fetches races and scrapes tips straight away
+        races_fetched_at = float("-inf")
+        tips_scraped_at = float("-inf")
+        day = None
+
+        while True:
+            try:
+                # New race day: start from scratch
+                if date.today() != day:
+                    day = date.today()
+                    races = []
+                    self.analyzed_tips.clear()
+                    self.verdicts.clear()
+
+                now = time.monotonic()
+
+                if not races or now - races_fetched_at >= POLL_RACES_INTERVAL:
+                    races = await self.fetch_races()
+                    races_fetched_at = now
+                    logger.info(f"✓ Tracking {len(races)} races")
+
+                changed_races = await self.fetch_and_save_odds(races)
+                dirty = {race.id for race in changed_races}
+
+                if races and now - tips_scraped_at >= POLL_TIPS_INTERVAL:
+                    tips = await self.scrape_tips(races)
+                    tips_scraped_at = now
+
+                    new_tips = [tip for tip in tips if self._tip_key(tip) not in self.analyzed_tips]
+                    if new_tips:
+                        analyzed_tips = await self.analyze_tips(new_tips)
+                        for tip in analyzed_tips:
+                            self.analyzed_tips[self._tip_key(tip)] = tip
+                        dirty |= {tip.race_id for tip in analyzed_tips}
+                        logger.info(f"✓ Analyzed {len(analyzed_tips)} new tips")
+
+                if dirty:
+                    tips = [tip for tip in self.analyzed_tips.values() if tip.race_id in dirty]
+                    dirty_races = [race for race in races if race.id in dirty]
+                    consensus_scores = await self.calculate_consensus(tips, dirty_races)
+                    await self.generate_verdicts(consensus_scores)
+                    logger.info(f"✓ Updated {len(consensus_scores)} consensus scores across {len(dirty)} races")
+
+                self._forget_races(self.odds_queue.prune(races))
+
+            except Exception as e:
+                logger.error(f"Error in polling cycle: {e}", exc_info=True)
+
+            delay = self._next_poll_delay(races, races_fetched_at, tips_scraped_at)
+            logger.debug(f"Next poll in {delay:.0f}s")
+            await asyncio.sleep(delay)
+
+    def _next_poll_delay(self, races: List[Race], races_fetched_at: float, tips_scraped_at: float) -> float:
+        """
+        Sleep until the next race's odds go stale or a fixed refresh is due
+        """
+        now = time.monotonic()
+        delays = [
+            POLL_RACES_INTERVAL - (now - races_fetched_at),
+            POLL_TIPS_INTERVAL - (now - tips_scraped_at),
+        ]
+
+        odds_due = self.odds_queue.seconds_until_due(races)
+        if odds_due is not None:
+            delays.append(odds_due)
+
+        return min(max(min(delays), POLL_MIN_SLEEP), POLL_MAX_SLEEP)
+
+    def _forget_races(self, race_ids: Set[str]):
+        """
+        Drop per-race fingerprints of races that have jumped, so a
+        long-running poller's maps don't grow across the day
+        """
+        if not race_ids:
+            return
+        self.racing_api.forget_races(race_ids)
+        self.race_inputs.drop(lambda key: key in race_ids)
+        self.consensus_fingerprints.drop(lambda key: key.rpartition(":")[0] in race_ids)
+
+    def _own_meets(self, meets: List[Meet]) -> List[Meet]:
+        """
+        Meets belonging to this shard
+        """
+        if self.shards == 1:
+            return meets
+        return [meet for meet in meets if meet_shard(meet.id, self.shards) == self.shard_index]
+
+    @staticmethod
+    def _tip_key(tip: ExpertTip) -> str:
+        return FingerprintStore.fingerprint([tip.race_id, tip.source, tip.runner_number, tip.raw_text])
+
     async def fetch_races(self) -> List[Race]:
         """
         Fetch today's Australian race meetings and races
+
+        Meets are fetched concurrently (bounded by MEET_FETCH_CONCURRENCY and
+        the Racing API rate limiter). Races are returned in meet order.
         """
         try:
             # Get today's meets
-            meets = await self.racing_api.get_todays_meets()
+            meets = self._own_meets(await self.racing_api.get_todays_meets())
             logger.info(f"Found {len(meets)} meets today")
 
-            all_races = []
+            semaphore = asyncio.Semaphore(MEET_FETCH_CONCURRENCY)
+            results = await asyncio.gather(
+                *(self._fetch_meet_races(meet, semaphore) for meet in meets)
+            )
 
-            for meet in meets:
-                logger.info(f"Fetching races for {meet.venue}...")
+            return [race for races in results for race in races]
 
-                # Get races for this meet
-                races = await self.racing_api.get_races_for_meet(meet.id)
+        except Exception as e:
+            logger.error(f"Error fetching races: {e}", exc_info=True)
+            return []
 
-                # Save meet to database
-                await self.db.upsert_meet(meet)
+    async def stream_races(self) -> AsyncIterator[List[Race]]:
+        """
+        Yield each meet's races as soon as they are fetched and saved
 
-                for race in races:
-                    # Save race to database
-                    await self.db.upsert_race(race)
-                    all_races.append(race)
+        Meets complete in whatever order the API answers; use fetch_races()
+        when a deterministic order is needed. With races_file the meets and
+        race lists come from the shard supervisor instead of the API.
+        """
+        shared = self._load_shared_races() if self.races_file else None
+
+        async def todays_meets() -> List[Meet]:
+            if shared is not None:
+                return [meet for meet, _ in shared.values()]
+            return await self.racing_api.get_todays_meets()
+
+        meets = await self._checkpointed(
+            "meets",
+            "all",
+            None,
+            todays_meets,
+            encode=lambda value: [meet.dict() for meet in value],
+            decode=lambda payload: [Meet(**meet) for meet in payload],
+            store_if=bool
+        )
+        meets = self._own_meets(meets)
+        logger.info(f"Found {len(meets)} meets today")
+
+        semaphore = asyncio.Semaphore(MEET_FETCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(self._checkpointed(
+                "races",
+                meet.id,
+                meet.dict(),
+                lambda meet=meet: self._fetch_meet_races(meet, semaphore, shared),
+                encode=lambda value: [race.dict() for race in value],
+                decode=lambda payload: [Race(**race) for race in payload],
+                store_if=bool
+            ))
+            for meet in meets
+        ]
 
-                # Rate limiting
-                await asyncio.sleep(0.5)
+        try:
+            for next_meet in asyncio.as_completed(tasks):
+                yield await next_meet
+        finally:
+            for task in tasks:
+                task.cancel()
 
-            return all_races
+    async def _fetch_meet_races(
+        self,
+        meet: Meet,
+        semaphore: asyncio.Semaphore,
+        shared: Optional[Dict[str, Tuple[Meet, List[Race]]]] = None
+    ) -> List[Race]:
+        """
+        Fetch races for one meet (or take them from the supervisor's shared
+        race lists) and save the meet and its races
+        """
+        if shared is not None:
+            races = shared[meet.id][1] if meet.id in shared else []
+        else:
+            async with semaphore:
+                logger.info(f"Fetching races for {meet.venue}...")
+                races = await self.racing_api.get_races_for_meet(meet.id)
+
+        # Skip the writes when the meet's races haven't changed since last saved
+        fingerprint = FingerprintStore.fingerprint(
+            [race.dict(exclude={'created_at', 'updated_at'}) for race in races]
+        )
+        if self.meet_fingerprints.is_unchanged(meet.id, fingerprint):
+            return races
 
+        # Save outside the semaphore so the next meet's API read overlaps the writes
+        try:
+            meet.num_races = len(races)
+            await self.db.upsert_meet(meet)
+            await asyncio.gather(*(self.db.upsert_race(race) for race in races))
+            self.meet_fingerprints.commit(meet.id)
         except Exception as e:
-            logger.error(f"Error fetching races: {e}", exc_info=True)
+            logger.error(f"Error saving races for {meet.venue}: {e}")
             return []
 
-    async def fetch_and_save_odds(self, races: List[Race]):
+        return races
+
+    def _load_shared_races(self) -> Dict[str, Tuple[Meet, List[Race]]]:
+        """
+        Meets and race lists fetched once by the shard supervisor, by meet id
+        """
+        with open(self.races_file) as f:
+            payload = json.load(f)
+        return {
+            entry["meet"]["id"]: (Meet(**entry["meet"]), [Race(**race) for race in entry["races"]])
+            for entry in payload
+        }
+
+    async def fetch_and_save_odds(self, races: List[Race]) -> List[Race]:
         """
         Fetch odds for all races and save to database
+
+        Races are refreshed soonest-jump first by ODDS_FETCH_CONCURRENCY
+        workers sharing the Racing API rate limit. Races that have already
+        started, whose odds are within their time-to-jump bucket's max
+        staleness, or whose runners and odds are unchanged since the last
+        run, are skipped.
+
+        Returns:
+            Races whose odds changed and were saved, in input order
         """
-        for race in races:
-            try:
-                # Get detailed race with odds
-                detailed_race = await self.racing_api.get_race_details(
-                    race.meet_id,
-                    race.race_number
-                )
+        started_before = self.odds_queue.dropped_started
+        fresh_before = self.odds_queue.skipped_fresh
+        self.odds_queue.push(races)
+
+        changed: Dict[str, Race] = {}
+        unchanged: List[str] = []
+
+        async def worker():
+            while True:
+                race = self.odds_queue.pop()
+                if race is None:
+                    return
+
+                try:
+                    detailed_race = await self._refresh_race_odds(race)
+                except Exception as e:
+                    logger.error(f"Error fetching odds for race {race.id}: {e}")
+                    continue
 
-                # Extract odds for each runner and bookmaker
-                for runner in detailed_race.runners:
-                    for bookmaker, odds_value in runner.get('odds', {}).items():
-                        odds = RaceOdds(
-                            race_id=race.id,
-                            runner_number=runner.get('number'),
-                            bookmaker=bookmaker,
-                            odds=odds_value
-                        )
-                        await self.db.save_odds(odds)
+                if detailed_race is None:
+                    unchanged.append(race.id)
+                else:
+                    changed[race.id] = detailed_race
 
-                # Rate limiting
-                await asyncio.sleep(0.5)
+        await asyncio.gather(*(worker() for _ in range(ODDS_FETCH_CONCURRENCY)))
 
-            except Exception as e:
-                logger.error(f"Error fetching odds for race {race.id}: {e}")
-                continue
+        self.racing_api.save_fingerprints()
+        logger.info(
+            f"Odds summary: {len(changed)} changed, "
+            f"{len(unchanged)} skipped (unchanged), "
+            f"{self.odds_queue.skipped_fresh - fresh_before} skipped (fresh), "
+            f"{self.odds_queue.dropped_started - started_before} skipped (started)"
+        )
+
+        return [changed[race.id] for race in races if race.id in changed]
+
+    async def _refresh_race_odds(self, race: Race) -> Optional[Race]:
+        """
+        Fetch and save odds for one race
+
+        Returns:
+            The detailed race, or None when its odds are unchanged
+        """
+        # Get detailed race with odds (None when unchanged)
+        detailed_race = await self.racing_api.get_race_details(
+            race.meet_id,
+            race.race_number,
+            skip_unchanged=True
+        )
+        self.odds_queue.mark_refreshed(race.id)
+
+        if detailed_race is None:
+            return None
+
+        # Extract odds for each runner and bookmaker
+        saved = True
+        for runner in detailed_race.runners:
+            for bookmaker, odds_value in runner.odds.items():
+                odds = RaceOdds(
+                    race_id=race.id,
+                    runner_number=runner.number,
+                    bookmaker=bookmaker,
+                    odds=odds_value
+                )
+                # save_odds logs and returns None on failure
+                saved = await self.db.save_odds(odds) is not None and saved
+
+        # Only skip the next write once every row is in
+        if saved:
+            self.racing_api.commit_race(race.id)
+        else:
+            logger.warning(f"Some odds for race {race.id} were not saved; they will be re-saved next run")
+        return detailed_race
 
     async def scrape_tips(self, races: List[Race]) -> List[ExpertTip]:
         """
-        Scrape expert tips from configured sources
+        Scrape expert tips from configured sources (or load the supervisor's, see tips_file)
         """
+        if self.tips_file:
+            return await self._load_shared_tips(races)
+
         try:
             tips = await self.tips_scraper.scrape_all_sources(races)
             return tips
@@ -175,6 +850,29 @@ class RacingAggregator:
             logger.error(f"Error scraping tips: {e}", exc_info=True)
             return []
 
+    async def _load_shared_tips(self, races: List[Race]) -> List[ExpertTip]:
+        """
+        Wait for the supervisor's tips file and return the tips for these races
+        """
+        deadline = time.monotonic() + SHARD_TIPS_TIMEOUT
+        while not os.path.exists(self.tips_file):
+            if time.monotonic() >= deadline:
+                logger.error(f"No shared tips after {SHARD_TIPS_TIMEOUT:.0f}s, continuing without tips")
+                return []
+            await asyncio.sleep(1)
+
+        try:
+            with open(self.tips_file) as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read shared tips {self.tips_file}: {e}")
+            return []
+
+        race_ids = {race.id for race in races}
+        tips = [ExpertTip(**tip) for tip in payload if tip["race_id"] in race_ids]
+        logger.info(f"Loaded {len(tips)} of {len(payload)} shared tips for this shard")
+        return tips
+
     async def analyze_tips(self, tips: List[ExpertTip]) -> List[ExpertTip]:
         """
         Analyze tips with Claude AI to extract confidence scores and categories
@@ -212,6 +910,13 @@ class RacingAggregator:
     ) -> List[ConsensusScore]:
         """
         Calculate consensus scores for each runner based on expert tips
+
+        Runners whose consensus is unchanged since it was last saved are
+        skipped, and a runner keeps its previous verdict when the verdict's
+        inputs (score and tip breakdown) haven't moved.
+
+        Returns:
+            Consensus scores that changed and were saved
         """
         consensus_scores = []
 
@@ -272,18 +977,40 @@ class RacingAggregator:
                     ai_verdict=""  # Will be generated in next step
                 )
 
+                key = f"{race.id}:{runner_num}"
+                fingerprint = FingerprintStore.fingerprint(
+                    consensus.dict(exclude={'ai_verdict', 'updated_at'})
+                )
+                if self.consensus_fingerprints.is_unchanged(key, fingerprint):
+                    continue
+
+                previous = self.verdicts.get(key)
+                if previous and previous[0] == self._verdict_inputs(consensus):
+                    consensus.ai_verdict = previous[1]
+
                 consensus_scores.append(consensus)
 
                 # Save to database
                 await self.db.save_consensus_score(consensus)
+                self.consensus_fingerprints.commit(key)
 
         return consensus_scores
 
     async def generate_verdicts(self, consensus_scores: List[ConsensusScore]):
         """
         Generate AI verdicts (1-sentence summaries) for each runner
+
+        Runners that kept their previous verdict are skipped.
+
+        Returns:
+            Number of verdicts generated
         """
+        generated = 0
+
         for consensus in consensus_scores:
+            if consensus.ai_verdict:
+                continue
+
             try:
                 # Get all tips for this runner
                 tips = await self.db.get_tips_for_runner(
@@ -305,6 +1032,11 @@ class RacingAggregator:
                     consensus.runner_number,
                     verdict
                 )
+                self.verdicts[f"{consensus.race_id}:{consensus.runner_number}"] = (
+                    self._verdict_inputs(consensus),
+                    verdict
+                )
+                generated += 1
 
                 # Rate limiting
                 await asyncio.sleep(0.2)
@@ -313,32 +1045,213 @@ class RacingAggregator:
                 logger.error(f"Error generating verdict for {consensus.runner_name}: {e}")
                 continue
 
-def run_scheduled():
+        return generated
+
+    def _race_inputs(self, race: Race, tips: List[ExpertTip]) -> str:
+        """
+        Fingerprint of everything a race's analysis/consensus depends on: its
+        latest odds payload and its tips
+        """
+        return FingerprintStore.fingerprint([
+            self.racing_api.race_fingerprint(race.id),
+            sorted([tip.source, tip.runner_number, tip.raw_text] for tip in tips),
+        ])
+
+    @staticmethod
+    def _verdict_inputs(consensus: ConsensusScore) -> str:
+        return FingerprintStore.fingerprint([consensus.consensus_score, consensus.tip_breakdown])
+
+def run_scheduled(
+    resume: bool = False,
+    profile: bool = False,
+    shards: int = 1,
+    shard_index: Optional[int] = None,
+    races_file: Optional[str] = None,
+    tips_file: Optional[str] = None
+):
     """
     Run the aggregator (called by scheduler)
+
+    With shards > 1 and no shard_index, runs every shard in its own process.
     """
-    aggregator = RacingAggregator()
-    asyncio.run(aggregator.run())
+    if shards > 1 and shard_index is None:
+        run_sharded(shards, resume=resume, profile=profile)
+        return
+
+    async def _run():
+        aggregator = RacingAggregator(
+            resume=resume,
+            profile=profile,
+            shards=shards,
+            shard_index=shard_index or 0,
+            races_file=races_file,
+            tips_file=tips_file
+        )
+        try:
+            await aggregator.run()
+        finally:
+            await aggregator.aclose()
+
+    asyncio.run(_run())
+
+def run_sharded(shards: int, resume: bool = False, profile: bool = False):
+    """
+    Run each shard as a child process and wait for all of them
+
+    Each child runs the pipeline for its meets while the shared token
+    bucket holds the combined Racing API rate at the contracted limit.
+    Today's meets and race lists are fetched once, here, before the shards
+    start, and tips are scraped and parsed once, here, while the shards
+    fetch odds: every shard needs the meet list and every tip source covers
+    every meet, so doing either per shard would multiply the Racing API
+    calls, the parsing work and the load on the tip sites by the shard
+    count. The children pick both up from per-run files.
+    """
+    races_file = os.path.join("cache", f"shard_races-{os.getpid()}.json")
+    tips_file = os.path.join("cache", f"shard_tips-{os.getpid()}.json")
+    if os.path.exists(tips_file):
+        os.remove(tips_file)
+
+    command = [
+        sys.executable, os.path.abspath(__file__), "--once",
+        "--shards", str(shards), "--races-file", races_file, "--tips-file", tips_file,
+    ]
+    if resume:
+        command.append("--resume")
+    if profile:
+        command.append("--profile")
+
+    try:
+        races = asyncio.run(fetch_shared_races(races_file))
+
+        logger.info(f"Starting {shards} aggregator shards")
+        processes = [
+            subprocess.Popen(command + ["--shard-index", str(index)])
+            for index in range(shards)
+        ]
+
+        asyncio.run(scrape_shared_tips(tips_file, races))
+        failed = [index for index, process in enumerate(processes) if process.wait() != 0]
+    finally:
+        for path in (races_file, tips_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    if failed:
+        raise RuntimeError(f"Aggregator shards failed: {failed}")
+
+    logger.info(f"✓ All {shards} shards completed")
+
+async def fetch_shared_races(path: str) -> List[Race]:
+    """
+    Fetch today's meets and their race lists once for every shard and write
+    them to path (see RacingAggregator races_file)
+
+    Returns:
+        Every race across all meets
+    """
+    racing_api = RacingAPIClient(
+        rate_limiter=SharedTokenBucket(RATE_LIMIT_STATE_FILE, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST),
+        fingerprints_file="race_fingerprints.supervisor.json"
+    )
+    try:
+        meets = await racing_api.get_todays_meets()
+        semaphore = asyncio.Semaphore(MEET_FETCH_CONCURRENCY)
+
+        async def meet_races(meet: Meet) -> List[Race]:
+            async with semaphore:
+                return await racing_api.get_races_for_meet(meet.id)
+
+        race_lists = await asyncio.gather(*(meet_races(meet) for meet in meets))
+    finally:
+        await racing_api.aclose()
+
+    write_json_atomic(
+        path,
+        [
+            {"meet": meet.dict(), "races": [race.dict() for race in races]}
+            for meet, races in zip(meets, race_lists)
+        ],
+        default=json_default
+    )
+    races = [race for races in race_lists for race in races]
+    logger.info(f"✓ Fetched {len(races)} races across {len(meets)} meets for all shards")
+    return races
+
+
+async def scrape_shared_tips(path: str, races: List[Race]):
+    """
+    Scrape and parse every tip source once against all of today's races and
+    write the tips to path for the shards (an empty list if scraping fails)
+    """
+    tips_scraper = TipsScraper()
+    tips: List[ExpertTip] = []
+
+    try:
+        if races:
+            tips = await tips_scraper.scrape_all_sources(races)
+        logger.info(f"✓ Scraped {len(tips)} expert tips for {len(races)} races across all shards")
+
+    except Exception as e:
+        logger.error(f"Error scraping shared tips: {e}", exc_info=True)
+
+    finally:
+        write_json_atomic(path, [tip.dict() for tip in tips], default=json_default)
+
+        logger.info(f"Tips scraper stats: {tips_scraper.stats()}")
+        await tips_scraper.aclose()
+        await get_browser_service().close()
+        shutdown_parse_executor()
+
+
+def run_polling():
+    """
+    Run the aggregator in continuous polling mode
+    """
+    async def _run():
+        aggregator = RacingAggregator()
+        try:
+            await aggregator.poll()
+        finally:
+            await aggregator.aclose()
+
+    asyncio.run(_run())
 
 if __name__ == "__main__":
-    # Check if running in schedule mode or one-time mode
+    # Pick up a crashed run at its first incomplete race/stage
+    resume = "--resume" in sys.argv
+    # Write cProfile dumps alongside the run metrics summary
+    profile = "--profile" in sys.argv
+
+    # Split meets across processes: --shards N [--shard-index i]
+    shards = int(sys.argv[sys.argv.index("--shards") + 1]) if "--shards" in sys.argv else 1
+    shard_index = int(sys.argv[sys.argv.index("--shard-index") + 1]) if "--shard-index" in sys.argv else None
+    # Set by run_sharded: read the supervisor's race lists and tips instead of fetching/scraping
+    races_file = sys.argv[sys.argv.index("--races-file") + 1] if "--races-file" in sys.argv else None
+    tips_file = sys.argv[sys.argv.index("--tips-file") + 1] if "--tips-file" in sys.argv else None
+
+    # Check if running in schedule, polling or one-time mode
     if len(sys.argv) > 1 and sys.argv[1] == "--once":
         # Run once and exit
         logger.info("Running in one-time mode")
-        run_scheduled()
+        run_scheduled(
+            resume=resume, profile=profile, shards=shards, shard_index=shard_index,
+            races_file=races_file, tips_file=tips_file
+        )
+    elif len(sys.argv) > 1 and sys.argv[1] == "--poll":
+        # Poll until stopped
+        logger.info("Running in polling mode")
+        run_polling()
     else:
         # Run on schedule
         logger.info("Running in scheduled mode")
 
-        # Get schedule from environment or use default
-        schedule_time = os.getenv("WORKER_SCHEDULE", "0 2 * * 1")  # Once a week (Monday at 2 AM)
-
         # Run once a week on Monday at 2 AM
-        schedule.every().monday.at("02:00").do(run_scheduled)
+        schedule.every().monday.at("02:00").do(run_scheduled, shards=shards, shard_index=shard_index)
 
         # Also run once at startup
         logger.info("Running initial aggregation...")
-        run_scheduled()
+        run_scheduled(resume=resume, profile=profile, shards=shards, shard_index=shard_index)
 
         logger.info(f"Worker scheduled to run once a week (Monday at 2 AM)")
 
@@ -11,6 +11,7 @@ Daily pipeline that:
 Usage:
     python workers/sport_aggregator.py --once    # Run once and exit
     python workers/sport_aggregator.py           # Run on schedule
+    python workers/sport_aggregator.py --once --profile  # Also write per-stage cProfile dumps
 """
 
 import asyncio
@@ -30,7 +31,10 @@ load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file_
 import httpx
 from utils.database import SupabaseClient
 from models.sport_models import SportMatch, SportExpertTip, SportTipConsensus
-from scrapers.sport_tips_scraper import SportTipsScraper
+from scrapers.sport_tips_scraper import SportTipsScraper, normalize_team_name
+from utils.run_metrics import RunMetrics
+from utils.browser_service import get_browser_service
+from utils.parse_pool import shutdown_parse_executor
 
 # Configure logging
 logger.add("logs/sport_worker.log", rotation="50 MB", retention="30 days", level="INFO")
@@ -46,17 +50,25 @@ LEAGUE_MAP = {
     "nrl": "NRL",
 }
 
+# Per-stage timing/throughput summaries (JSON) and --profile cProfile dumps
+METRICS_DIR = os.getenv("METRICS_DIR", "logs/metrics")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+
 
 class SportAggregator:
     """Main orchestrator for AFL/NRL data pipeline"""
 
-    def __init__(self):
+    def __init__(self, profile: bool = False):
         self.db = SupabaseClient()
-        self.scraper = SportTipsScraper()
         self.api_key = os.getenv("THEODDSAPI_KEY")
         if not self.api_key:
             raise ValueError("THEODDSAPI_KEY must be set")
 
+        # Per-stage timing, emitted at the end of run(); tip sources add a
+        # tips_<source> stage each
+        self.metrics = RunMetrics("sport", METRICS_DIR, PROFILE_DIR if profile else None)
+        self.scraper = SportTipsScraper(metrics=self.metrics)
+
     async def run(self):
         """Main execution flow"""
         try:
@@ -68,15 +80,17 @@ class SportAggregator:
             all_matches = []
 
             # Step 1: Fetch odds from TheOddsAPI
-            for sport, sport_key in SPORT_KEYS.items():
-                logger.info(f"Step 1: Fetching odds for {sport.upper()}...")
-                try:
-                    matches = await self.fetch_odds(sport, sport_key)
-                    logger.info(f"  Fetched {len(matches)} {sport.upper()} matches")
-                    all_matches.extend(matches)
-                except Exception as e:
-                    logger.error(f"Failed to fetch odds for {sport.upper()}: {e}")
-                    continue
+            with self.metrics.stage("fetch_odds", profile=True) as stage:
+                for sport, sport_key in SPORT_KEYS.items():
+                    logger.info(f"Step 1: Fetching odds for {sport.upper()}...")
+                    try:
+                        matches = await self.fetch_odds(sport, sport_key)
+                        logger.info(f"  Fetched {len(matches)} {sport.upper()} matches")
+                        all_matches.extend(matches)
+                    except Exception as e:
+                        logger.error(f"Failed to fetch odds for {sport.upper()}: {e}")
+                        continue
+                stage.items = len(all_matches)
 
             if not all_matches:
                 logger.warning("No matches found. Exiting.")
@@ -84,8 +98,10 @@ class SportAggregator:
 
             # Steps 2-4: Aggregate, calculate, and save
             logger.info("Step 2-4: Aggregating odds, calculating predictions, saving to DB...")
-            for match in all_matches:
-                await self.db.upsert_sport_match(match)
+            with self.metrics.stage("save_matches", profile=True) as stage:
+                for match in all_matches:
+                    await self.db.upsert_sport_match(match)
+                stage.items = len(all_matches)
             logger.info(f"  Saved {len(all_matches)} matches to Supabase")
 
             # Step 5: Scrape expert tips and calculate consensus
@@ -100,20 +116,26 @@ class SportAggregator:
                 }
                 for m in all_matches
             ]
-            tips = await self.scraper.scrape_all(match_dicts)
+            with self.metrics.stage("scrape_tips", profile=True) as stage:
+                tips = await self.scraper.scrape_all(match_dicts)
+                stage.items = len(tips)
             logger.info(f"  Scraped {len(tips)} expert tips")
 
             # Save tips to database
-            for tip_dict in tips:
-                try:
-                    tip = SportExpertTip(**tip_dict)
-                    await self.db.save_sport_expert_tip(tip)
-                except Exception as e:
-                    logger.error(f"Error saving tip: {e}")
+            with self.metrics.stage("save_tips", profile=True) as stage:
+                for tip_dict in tips:
+                    try:
+                        tip = SportExpertTip(**tip_dict)
+                        await self.db.save_sport_expert_tip(tip)
+                        stage.items += 1
+                    except Exception as e:
+                        logger.error(f"Error saving tip: {e}")
 
             # Calculate consensus for each match
             logger.info("Calculating tip consensus...")
-            await self.calculate_consensus(all_matches, tips)
+            with self.metrics.stage("consensus", profile=True) as stage:
+                await self.calculate_consensus(all_matches, tips)
+                stage.items = len(all_matches)
 
             logger.info("=" * 60)
             logger.info("Sport Aggregator run completed successfully!")
@@ -123,6 +145,16 @@ class SportAggregator:
             logger.error(f"Error in sport aggregator run: {e}", exc_info=True)
             raise
 
+        finally:
+            if self.scraper.source_stats:
+                logger.info(f"Tip source stats: {self.scraper.source_stats}")
+            self.metrics.emit()
+
+    async def aclose(self):
+        """Release long-lived resources (warm browser, parse workers)"""
+        await get_browser_service().close()
+        shutdown_parse_executor()
+
     async def fetch_odds(self, sport: str, sport_key: str) -> List[SportMatch]:
         """
         Fetch odds from TheOddsAPI for a sport.
@@ -337,6 +369,8 @@ class SportAggregator:
             home_tips = 0
             away_tips = 0
             margins = []
+            home_canonical = normalize_team_name(match.home_team, match.sport)
+            away_canonical = normalize_team_name(match.away_team, match.sport)
 
             for tip in match_tips:
                 tipped = tip["tipped_team"]
@@ -346,10 +380,7 @@ class SportAggregator:
                     away_tips += 1
                 else:
                     # Try fuzzy match
-                    from scrapers.sport_tips_scraper import normalize_team_name
                     canonical = normalize_team_name(tipped, match.sport)
-                    home_canonical = normalize_team_name(match.home_team, match.sport)
-                    away_canonical = normalize_team_name(match.away_team, match.sport)
                     if canonical == home_canonical:
                         home_tips += 1
                     elif canonical == away_canonical:
@@ -398,17 +429,26 @@ class SportAggregator:
                 logger.error(f"Error saving consensus for {match.id}: {e}")
 
 
-def run_once():
+def run_once(profile: bool = False):
     """Run the aggregator once"""
-    aggregator = SportAggregator()
-    asyncio.run(aggregator.run())
+    async def _run():
+        aggregator = SportAggregator(profile=profile)
+        try:
+            await aggregator.run()
+        finally:
+            await aggregator.aclose()
+
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
+    # Write per-stage cProfile dumps alongside the run metrics summary
+    profile = "--profile" in sys.argv
+
     if len(sys.argv) > 1 and sys.argv[1] == "--once":
         logger.info("Running in one-time mode")
-        run_once()
+        run_once(profile=profile)
     else:
         # Default: run once (designed to be called by cron)
         logger.info("Running sport aggregator...")
-        run_once()
+        run_once(profile=profile)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on saved tip pages
+
+Runs each tip parser over the given pages with every installed backend
+(selectolax, lxml, bs4) and reports milliseconds per page and the number
+of tips found, so backends can be compared and checked for agreement.
+Race/runner matching is stubbed out to accept everything, so the timings
+cover parsing and extraction only.
+
+Usage:
+    python3 scripts/benchmark_parsers.py                         # synthetic pages
+    python3 scripts/benchmark_parsers.py --parser sky saved/sky-*.html
+    python3 scripts/benchmark_parsers.py --parser footyforecaster --iterations 50 saved/ff.html
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from utils import html_parser
+from scrapers.tips_scraper import parse_racing_com, parse_sky_racing
+from scrapers.sport_tips_scraper import parse_footyforecaster
+
+
+class _AnyRace:
+    id = "benchmark"
+
+
+class _AnyRaceIndex:
+    """Matches every venue and runner, so parsers extract every tip on the page"""
+
+    def find_race(self, venue: str, race_number: int):
+        return _AnyRace()
+
+    def find_runner_number(self, race, runner_name: str) -> int:
+        return 1
+
+
+PARSERS: Dict[str, Callable[[str], List[Dict]]] = {
+    "racing_com": lambda html: parse_racing_com(html, _AnyRaceIndex(), "Racing.com"),
+    "sky": lambda html: parse_sky_racing(html, _AnyRaceIndex(), "Sky Racing"),
+    "footyforecaster": lambda html: parse_footyforecaster(html, "afl"),
+}
+
+
+def synthetic_page(parser: str, races: int = 80, runners: int = 12) -> str:
+    """
+    Build a large page in the shape each parser expects
+    """
+    if parser == "footyforecaster":
+        games = "".join(
+            f"<div><h3>Team {i} v Team {i + 1} (Ground {i})</h3><p>Probability</p>"
+            f"<p>Team {i} 61.0% Team {i + 1} 39.0%</p><p>Forecast</p><p>Team {i} by {i % 30 + 1} points</p></div>"
+            for i in range(races)
+        )
+        return f"<html><body>{games}</body></html>"
+
+    sections = []
+    for race in range(races):
+        if parser == "sky":
+            selections = "".join(
+                f"<li class='selection-item'><span class='horse'>Runner {race}-{n}</span>"
+                f"<p class='analysis'>Drawn well, should settle handy and finish strongly.</p></li>"
+                for n in range(runners)
+            )
+            sections.append(
+                f"<div class='tip-card'><span class='venue-name'>Venue {race % 10}</span>"
+                f"<span class='race-num'>Race {race % 10 + 1}</span><ul>{selections}</ul></div>"
+            )
+        else:
+            selections = "".join(
+                f"<div class='runner-tip'><span class='runner-name'>Runner {race}-{n}</span>"
+                f"<p class='comment'>Drawn well, should settle handy and finish strongly.</p></div>"
+                for n in range(runners)
+            )
+            sections.append(
+                f"<section class='tip-section'><h2 class='venue'>Venue {race % 10}</h2>"
+                f"<span class='race-number'>R{race % 10 + 1}</span>{selections}</section>"
+            )
+
+    return f"<html><body>{''.join(sections)}</body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on tip pages")
+    parser.add_argument("pages", nargs="*", help="Saved HTML pages (default: a synthetic page)")
+    parser.add_argument("--parser", choices=sorted(PARSERS), default="racing_com")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = []
+        for path in args.pages:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    else:
+        pages = [synthetic_page(args.parser)]
+
+    parse = PARSERS[args.parser]
+    size_kb = sum(len(page) for page in pages) / 1024
+
+    print("=" * 60)
+    print(f"Parser: {args.parser}  Pages: {len(pages)} ({size_kb:.0f} KB)  Iterations: {args.iterations}")
+    print("=" * 60)
+
+    results = {}
+    for backend in html_parser.available_backends():
+        html_parser.PARSER_BACKEND = backend
+
+        tips = sum(len(parse(page)) for page in pages)  # Warm-up and result check
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            for page in pages:
+                parse(page)
+        elapsed = time.perf_counter() - start
+
+        ms_per_page = elapsed * 1000 / (args.iterations * len(pages))
+        results[backend] = ms_per_page
+        print(f"{backend:<12} {ms_per_page:9.2f} ms/page  {tips:6d} tips")
+
+    baseline = results.get("bs4")
+    if baseline:
+        print("-" * 60)
+        for backend, ms_per_page in results.items():
+            print(f"{backend:<12} {baseline / ms_per_page:6.1f}x vs bs4")
+
+
+if __name__ == "__main__":
+    main()